@@ -12,6 +12,7 @@ import uuid
 import os
 
 from ..cem_engine.orchestrator import EngineOrchestrator
+from ..cem_engine.llm_engine import close_llm_engine
 from ..intelligence.market_search import search_part
 from ..config import CONFIG
 
@@ -58,6 +59,12 @@ class DesignStatus(BaseModel):
 # In-memory job storage
 jobs_db: Dict[str, DesignStatus] = {}
 
+@app.on_event("shutdown")
+async def shutdown():
+    # Close pooled Ollama connections and stop the background Blender worker
+    await close_llm_engine()
+    await orchestrator.blender_sim.close()
+
 @app.get("/")
 async def root():
     return {"message": "Robot CEM Studio API v1.1.0", "status": "operational"}
@@ -45,6 +45,13 @@ def get_orchestrator() -> EngineOrchestrator:
     return _orchestrator
 
 
+@router.on_event("shutdown")
+async def close_orchestrator():
+    """Stop the orchestrator's background Blender worker, if one was started"""
+    if _orchestrator is not None:
+        await _orchestrator.blender_sim.close()
+
+
 # ============================================================================
 # Request/Response Models
 # ============================================================================
@@ -507,6 +507,10 @@ Output should be a JSON with 'analysis' (string) and 'suggested_fixes' (list of
         
         return json.loads(response["response"])
 
+    async def close(self) -> None:
+        """Release the Ollama client's pooled connections"""
+        await self.client.close()
+
     def get_conversation_state(self, session_id: str) -> Optional[Dict]:
         """Retrieve full conversation state"""
         context = self.conversation_contexts.get(session_id)
@@ -526,3 +530,9 @@ def get_llm_engine() -> AdvancedLLMEngine:
         _llm_engine = AdvancedLLMEngine()
         logger.info("Initialized AdvancedLLMEngine with Aurora/Ollama")
     return _llm_engine
+
+
+async def close_llm_engine() -> None:
+    """Close the global LLM engine's connections, if it was created"""
+    if _llm_engine is not None:
+        await _llm_engine.close()
@@ -0,0 +1,88 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+from backend.utils.blender_sim import BlenderSimulator
+
+WORKER_SCRIPT = Path(__file__).resolve().parents[2] / "scripts" / "blender_worker.py"
+
+
+@pytest.fixture
+def simulator(tmp_path):
+    # Stand-in for Blender: runs the --python script with this interpreter
+    blender = tmp_path / "blender"
+    blender.write_text(
+        f"#!{sys.executable}\n"
+        "import runpy, sys\n"
+        "print('Blender (fake) banner', flush=True)\n"
+        "runpy.run_path(sys.argv[sys.argv.index('--python') + 1], run_name='__main__')\n"
+    )
+    blender.chmod(0o755)
+    sim = BlenderSimulator(blender_path=str(blender), job_timeout=5)
+    sim.worker_script_path = WORKER_SCRIPT
+    return sim
+
+
+def _script(tmp_path, name, body):
+    path = tmp_path / name
+    path.write_text(body)
+    return str(path)
+
+
+@pytest.mark.asyncio
+async def test_worker_skips_replies_for_other_jobs(simulator, tmp_path):
+    stale = _script(tmp_path, "stale.py", "print('@@robotcem@@ {\"id\": -1, \"ok\": false}', flush=True)\n")
+    try:
+        assert await simulator._run_in_worker(stale, []) == (0, "")
+        assert await simulator._run_in_worker(stale, []) == (0, "")
+    finally:
+        await simulator.close()
+
+
+@pytest.mark.asyncio
+async def test_worker_timeout_discards_worker(simulator, tmp_path):
+    slow = _script(tmp_path, "slow.py", "import time\ntime.sleep(30)\n")
+    ok = _script(tmp_path, "ok.py", "")
+    simulator.job_timeout = 0.5
+    try:
+        returncode, details = await simulator._run_in_worker(slow, [])
+        assert returncode == 1
+        assert "timed out" in details
+        assert simulator._worker is None
+        simulator.job_timeout = 5
+        assert await simulator._run_in_worker(ok, []) == (0, "")
+    finally:
+        await simulator.close()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_job_kills_worker(simulator, tmp_path):
+    slow = _script(tmp_path, "slow.py", "import time\ntime.sleep(30)\n")
+    ok = _script(tmp_path, "ok.py", "")
+    try:
+        job = asyncio.create_task(simulator._run_in_worker(slow, []))
+        await asyncio.sleep(0.5)
+        worker = simulator._worker
+        job.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await job
+        assert await asyncio.wait_for(worker.wait(), timeout=5) is not None
+        assert await simulator._run_in_worker(ok, []) == (0, "")
+    finally:
+        await simulator.close()
+
+
+@pytest.mark.asyncio
+async def test_overlong_output_line_discards_worker(simulator, tmp_path):
+    noisy = _script(tmp_path, "noisy.py", "print('x' * (2 << 20), flush=True)\n")
+    ok = _script(tmp_path, "ok.py", "")
+    try:
+        returncode, details = await simulator._run_in_worker(noisy, [])
+        assert returncode == 1
+        assert "Unreadable output" in details
+        assert simulator._worker is None
+        assert await simulator._run_in_worker(ok, []) == (0, "")
+    finally:
+        await simulator.close()
@@ -0,0 +1,100 @@
+import random
+
+import pytest
+
+from backend.training import llm_trainer
+from backend.training.llm_trainer import LLMDomainAdapter
+
+
+def _item(title, content, category="robotics"):
+    return {"category": category, "title": title, "content": content, "tags": ["gripper"]}
+
+
+def test_identical_items_are_ingested_once():
+    adapter = LLMDomainAdapter()
+    adapter._process_training_item(_item("Grip force", "Use 50-500N"))
+    adapter._process_training_item(_item("Grip force", "Use 50-500N"))
+    adapter._process_training_item(_item("Grip force", "Use 60-600N"))
+    adapter._process_training_item(_item("Grip range", "Use 50-500N"))
+    assert len(adapter.knowledge_base["robotics"]) == 3
+
+
+def test_non_string_fields_are_accepted():
+    adapter = LLMDomainAdapter()
+    item = {"category": None, "title": "Servo", "content": "MG996R", "intent": None,
+            "domain": 3, "tags": ["servo", 42]}
+    adapter._process_training_item(item)
+    example = adapter.training_examples[-1]
+    assert example.category is None
+    assert example.intent is None
+    assert example.domain == 3
+    assert example.tags == ["servo", 42]
+    assert adapter.create_knowledge_index()[None] == ["Servo [servo, 42]"]
+    assert adapter._find_relevant_knowledge(["servo"]) == [item]
+
+
+def _reference_ranking(adapter, keywords):
+    # Scoring as it was before the keyword index: stable sort over knowledge_base order
+    relevant = []
+    for items in adapter.knowledge_base.values():
+        for item in items:
+            matches = sum(1 for kw in keywords for tag in item["tags"] if kw.lower() in tag.lower())
+            if matches > 0:
+                relevant.append((item, matches))
+    relevant.sort(key=lambda x: x[1], reverse=True)
+    return [item for item, _ in relevant]
+
+
+def _random_items(rng, count, start=0):
+    vocab = ["Gripper", "servo", "lattice", "PLA", "bearing", "arm", "gear", "frame"]
+    return [
+        {
+            "category": rng.choice(["robotics", "cem", "lattice_library", "books"]),
+            "title": f"item {start + i}",
+            "content": f"content {start + i}",
+            "tags": rng.sample(vocab, rng.randint(0, 4)) + [rng.choice(vocab) + "_mount"],
+        }
+        for i in range(count)
+    ]
+
+
+@pytest.mark.parametrize("count", [40, 300])
+def test_ranking_matches_reference(count):
+    rng = random.Random(count)
+    adapter = LLMDomainAdapter()
+    queries = [["servo"], ["gripper", "arm"], ["mount", "pla", "gear"], ["servo", "servo"], ["nothing"]]
+
+    items = _random_items(rng, count)
+    half = count // 2
+    for item in items[:half]:
+        adapter._process_training_item(item)
+    for keywords in queries:
+        assert adapter._find_relevant_knowledge(keywords) == _reference_ranking(adapter, keywords)
+
+    # Later ingests must show up in the cached postings and score matrix
+    for item in items[half:]:
+        adapter._process_training_item(item)
+    assert (len(adapter._items_flat) >= llm_trainer._SPARSE_SCORING_MIN_ITEMS) == (count > 128)
+    for keywords in queries:
+        expected = _reference_ranking(adapter, keywords)
+        assert adapter._find_relevant_knowledge(keywords) == expected
+        assert adapter._find_relevant_knowledge(keywords, limit=5) == expected[:5]
+
+
+def test_sparse_and_counter_paths_agree(monkeypatch):
+    rng = random.Random(7)
+    items = _random_items(rng, 60)
+    queries = [["servo"], ["gripper", "arm", "mount"], ["bearing", "frame", "frame"]]
+
+    rankings = []
+    for threshold in (10 ** 9, 1):
+        monkeypatch.setattr(llm_trainer, "_SPARSE_SCORING_MIN_ITEMS", threshold)
+        adapter = LLMDomainAdapter()
+        for item in items:
+            adapter._process_training_item(item)
+        rankings.append([
+            [item["title"] for item in adapter._find_relevant_knowledge(keywords, limit)]
+            for keywords in queries
+            for limit in (None, 3)
+        ])
+    assert rankings[0] == rankings[1]
@@ -0,0 +1,25 @@
+import asyncio
+
+from backend.utils.ollama_client import OllamaClient
+
+
+def test_session_closed_when_its_loop_shuts_down():
+    client = OllamaClient()
+    first = asyncio.run(client._get_session())
+    assert first.closed
+
+    second = asyncio.run(client._get_session())
+    assert second is not first
+    assert second.closed
+
+
+def test_stale_session_closed_on_next_loop():
+    client = OllamaClient()
+    loop = asyncio.new_event_loop()
+    # Closed without finalizing async generators, unlike asyncio.run()
+    stale = loop.run_until_complete(client._get_session())
+    loop.close()
+    assert not stale.closed
+
+    asyncio.run(client._get_session())
+    assert stale.closed
@@ -0,0 +1,11 @@
+from backend.training.real_geometry_trainer import RealGeometryTrainer
+
+
+def test_training_examples_are_per_trainer():
+    first = RealGeometryTrainer("/nonexistent", "/nonexistent").generate_training_examples()
+    first[0]["geometry_spec"]["parameters"]["length"] = 99
+    first.pop()
+
+    second = RealGeometryTrainer("/nonexistent", "/nonexistent").generate_training_examples()
+    assert second[0]["geometry_spec"]["parameters"]["length"] == 20
+    assert len(second) == len(first) + 1
@@ -0,0 +1,14 @@
+from backend.utils.text_reader import read_text
+
+
+def test_read_text_matches_text_mode_read(tmp_path):
+    path = tmp_path / "book.txt"
+    path.write_bytes("Gear ratio\r\nTorque ±5%\rend\n".encode("utf-8"))
+    with open(path, encoding="utf-8") as f:
+        assert read_text(path) == f.read()
+
+
+def test_read_text_empty_file(tmp_path):
+    path = tmp_path / "empty.txt"
+    path.write_bytes(b"")
+    assert read_text(path) == ""
@@ -0,0 +1,36 @@
+from backend.tools.tool_registry import ToolRegistry
+
+
+def test_json_schema_does_not_expose_cached_state():
+    registry = ToolRegistry()
+    before = registry.to_json_schema_str()
+    schema = registry.to_json_schema()
+    for prop in schema[0]['function']['parameters']['properties'].values():
+        prop['description'] = 'edited'
+
+    again = registry.to_json_schema()
+    assert all(
+        prop['description'] != 'edited'
+        for prop in again[0]['function']['parameters']['properties'].values()
+    )
+    assert registry.to_json_schema_str() == before
+
+
+def test_to_dict_does_not_expose_cached_state():
+    registry = ToolRegistry()
+    payloads = registry.to_dict()
+    name, payload = next(iter(payloads.items()))
+    payload['description'] = 'edited'
+    payload['parameters'][0]['name'] = 'edited'
+    payload['returns']['edited'] = 'edited'
+
+    again = ToolRegistry().to_dict()[name]
+    assert again['description'] != 'edited'
+    assert again['parameters'][0]['name'] != 'edited'
+    assert 'edited' not in again['returns']
+    assert registry.to_dict()[name]['description'] != 'edited'
+
+
+def test_examples_included_by_default():
+    payloads = ToolRegistry().to_dict()
+    assert any(payload['examples'] for payload in payloads.values())
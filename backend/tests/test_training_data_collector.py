@@ -0,0 +1,25 @@
+import json
+
+from backend.training.training_data_collector import TrainingDataCollector
+
+
+def test_collected_items_are_independent():
+    collector = TrainingDataCollector()
+    first = collector.collect_shape_kernel_knowledge()
+    first[0]["tags"].append("edited")
+    first[0]["metadata"]["shape"] = "edited"
+    first[0]["title"] = "edited"
+
+    again = TrainingDataCollector().collect_all_knowledge()[0]
+    assert "edited" not in again["tags"]
+    assert again["metadata"]["shape"] == "BaseBox"
+    assert again["title"] == "ShapeKernel BaseBox"
+
+
+def test_all_knowledge_matches_table_round_trip():
+    collector = TrainingDataCollector()
+    items = collector.collect_all_knowledge()
+    assert len(items) == 23
+    assert all("training_text" not in item["metadata"] for item in items)
+    table_items = collector.collect_knowledge_table().to_aos()
+    assert json.dumps(table_items) == json.dumps(items)
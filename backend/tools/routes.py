@@ -6,6 +6,7 @@ Provides both individual endpoint access and integrated tool discovery.
 """
 
 from fastapi import APIRouter, HTTPException, Query, BackgroundTasks
+from fastapi.responses import Response
 from pydantic import BaseModel, Field
 from typing import Optional, Dict, Any, List
 import logging
@@ -247,10 +248,9 @@ async def tools_root():
 @router.get("/schema")
 async def tools_schema():
     """Get LLM-compatible JSON schema for all tools."""
-    return {
-        "type": "function",
-        "functions": registry.to_json_schema()
-    }
+    # Splice the registry's cached bytes instead of re-encoding the schema
+    body = b'{"type":"function","functions":' + registry.to_json_schema_str() + b'}'
+    return Response(content=body, media_type="application/json")
 
 
 @router.get("/tools")
@@ -5,6 +5,9 @@ Integration test and demo showing trained LLM and CEM in action.
 import sys
 from pathlib import Path
 import asyncio
+import contextlib
+import functools
+import threading
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
@@ -13,127 +16,158 @@ from backend.cem_engine.llm_engine import get_llm_engine
 from backend.training.llm_trainer import LLMDomainAdapter, CEMTrainer
 
 
+_adapter_lock = threading.Lock()
+
+
+@contextlib.contextmanager
+def _buffered_output():
+    """Collect a test's report lines and write them to stdout in one call."""
+    lines = []
+    try:
+        yield lines.append
+    finally:
+        sys.stdout.write("\n".join(lines) + "\n")
+
+
+@functools.cache
+def _load_shared_adapter() -> LLMDomainAdapter:
+    adapter = LLMDomainAdapter()
+    adapter.load_training_data()
+    return adapter
+
+
+def _shared_adapter() -> LLMDomainAdapter:
+    """Training-data-loaded adapter shared by the adapter tests (loaded once)."""
+    # Tests run in worker threads; make sure only one of them does the load
+    with _adapter_lock:
+        return _load_shared_adapter()
+
+
 async def test_domain_adapted_parsing():
     """Test LLM parsing with domain adaptation"""
-    print("\n" + "="*80)
-    print("TEST 1: DOMAIN-ADAPTED PROMPT PARSING")
-    print("="*80)
-    
-    parser = PromptParser()
-    
-    test_prompts = [
-        "I need a lightweight gripper with 2kg payload for pick and place",
-        "Create a 6-DOF robot arm, 500mm reach, cost-effective design",
-        "Design a bearing assembly for a rotating shaft"
-    ]
-    
-    for i, prompt in enumerate(test_prompts, 1):
-        print(f"\n📝 Test {i}: {prompt}")
-        try:
-            result = await parser.parse(prompt)
-            print(f"   ✓ Device type: {result.get('device_type', 'N/A')}")
-            print(f"   ✓ Confidence: {result.get('_specificity_score', 0):.0%}")
-            print(f"   ✓ Domain adapted: {result.get('_domain_adapted', False)}")
-        except Exception as e:
-            print(f"   ✗ Error: {e}")
+    with _buffered_output() as emit:
+        emit("\n" + "="*80)
+        emit("TEST 1: DOMAIN-ADAPTED PROMPT PARSING")
+        emit("="*80)
+
+        parser = PromptParser()
+
+        test_prompts = [
+            "I need a lightweight gripper with 2kg payload for pick and place",
+            "Create a 6-DOF robot arm, 500mm reach, cost-effective design",
+            "Design a bearing assembly for a rotating shaft"
+        ]
+
+        for i, prompt in enumerate(test_prompts, 1):
+            emit(f"\n📝 Test {i}: {prompt}")
+            try:
+                result = await parser.parse(prompt)
+                emit(f"   ✓ Device type: {result.get('device_type', 'N/A')}")
+                emit(f"   ✓ Confidence: {result.get('_specificity_score', 0):.0%}")
+                emit(f"   ✓ Domain adapted: {result.get('_domain_adapted', False)}")
+            except Exception as e:
+                emit(f"   ✗ Error: {e}")
 
 
 def test_domain_adapter_enhancement():
     """Test domain adapter prompt enhancement"""
-    print("\n" + "="*80)
-    print("TEST 2: DOMAIN ADAPTER PROMPT ENHANCEMENT")
-    print("="*80)
-    
-    adapter = LLMDomainAdapter()
-    num_loaded = adapter.load_training_data()
-    print(f"\n✓ Loaded {num_loaded} training items")
-    
-    test_prompts = [
-        "What is BaseSphere used for?",
-        "Which lattice provides best weight reduction?",
-        "Design rules for grippers",
-        "How to optimize for lightweight?"
-    ]
-    
-    for i, prompt in enumerate(test_prompts, 1):
-        print(f"\n📝 Test {i}: {prompt}")
-        enhanced = adapter.enhance_prompt_with_context(prompt, "design")
-        
-        if enhanced != prompt:
-            print(f"   ✓ Enhanced with context")
-            print(f"   Context preview: ...{enhanced[-100:]}")
-        else:
-            print(f"   No enhancement available")
+    with _buffered_output() as emit:
+        emit("\n" + "="*80)
+        emit("TEST 2: DOMAIN ADAPTER PROMPT ENHANCEMENT")
+        emit("="*80)
+
+        adapter = _shared_adapter()
+        num_loaded = sum(len(items) for items in adapter.knowledge_base.values())
+        emit(f"\n✓ Loaded {num_loaded} training items")
+
+        test_prompts = [
+            "What is BaseSphere used for?",
+            "Which lattice provides best weight reduction?",
+            "Design rules for grippers",
+            "How to optimize for lightweight?"
+        ]
+
+        for i, prompt in enumerate(test_prompts, 1):
+            emit(f"\n📝 Test {i}: {prompt}")
+            enhanced = adapter.enhance_prompt_with_context(prompt, "design")
+
+            if enhanced != prompt:
+                emit(f"   ✓ Enhanced with context")
+                emit(f"   Context preview: ...{enhanced[-100:]}")
+            else:
+                emit(f"   No enhancement available")
 
 
 def test_cem_training_data():
     """Test CEM training data access"""
-    print("\n" + "="*80)
-    print("TEST 3: CEM TRAINING DATA ACCESS")
-    print("="*80)
-    
-    trainer = CEMTrainer()
-    trainer.load_robotics_design_rules()
-    trainer.load_manufacturing_rules()
-    trainer.load_material_database()
-    
-    # Test design rules
-    print("\n📋 Gripper Design Rules:")
-    for rule in trainer.design_rules.get("gripper", [])[:3]:
-        print(f"   • {rule}")
-    
-    # Test manufacturing
-    print("\n🔧 FDM Manufacturing Specs:")
-    fdm_specs = trainer.manufacturing_rules.get("FDM", {})
-    print(f"   • Min wall thickness: {fdm_specs.get('min_wall_thickness')}mm")
-    print(f"   • Tolerance: ±{fdm_specs.get('tolerance')}mm")
-    print(f"   • Materials: {', '.join(fdm_specs.get('material', []))}")
-    
-    # Test materials
-    print("\n📦 PLA Properties:")
-    pla = trainer.material_database.get("PLA", {})
-    print(f"   • Cost: ${pla.get('cost_per_kg'):.1f}/kg")
-    print(f"   • Density: {pla.get('density_g_cm3')} g/cm³")
-    print(f"   • Tensile strength: {pla.get('tensile_strength_mpa')} MPa")
+    with _buffered_output() as emit:
+        emit("\n" + "="*80)
+        emit("TEST 3: CEM TRAINING DATA ACCESS")
+        emit("="*80)
+
+        trainer = CEMTrainer()
+        trainer.load_robotics_design_rules()
+        trainer.load_manufacturing_rules()
+        trainer.load_material_database()
+
+        # Test design rules
+        emit("\n📋 Gripper Design Rules:")
+        for rule in trainer.design_rules.get("gripper", [])[:3]:
+            emit(f"   • {rule}")
+
+        # Test manufacturing
+        emit("\n🔧 FDM Manufacturing Specs:")
+        fdm_specs = trainer.manufacturing_rules.get("FDM", {})
+        emit(f"   • Min wall thickness: {fdm_specs.get('min_wall_thickness')}mm")
+        emit(f"   • Tolerance: ±{fdm_specs.get('tolerance')}mm")
+        emit(f"   • Materials: {', '.join(fdm_specs.get('material', []))}")
+
+        # Test materials
+        emit("\n📦 PLA Properties:")
+        pla = trainer.material_database.get("PLA", {})
+        emit(f"   • Cost: ${pla.get('cost_per_kg'):.1f}/kg")
+        emit(f"   • Density: {pla.get('density_g_cm3')} g/cm³")
+        emit(f"   • Tensile strength: {pla.get('tensile_strength_mpa')} MPa")
 
 
 def test_intent_analysis():
     """Test NaturalLanguageAnalyzer"""
-    print("\n" + "="*80)
-    print("TEST 4: INTENT ANALYSIS")
-    print("="*80)
-    
-    analyzer = NaturalLanguageAnalyzer()
-    
-    test_prompts = [
-        "Lightweight gripper for delicate items",
-        "Heavy-duty industrial robot arm",
-        "Cost-effective 3D printed bracket"
-    ]
-    
-    for i, prompt in enumerate(test_prompts, 1):
-        print(f"\n📝 Test {i}: {prompt}")
-        intent = analyzer.extract_intent(prompt)
-        print(f"   • Device: {intent['detected_device_type']}")
-        print(f"   • Goals: {', '.join(intent['optimization_goals'])}")
-        print(f"   • Specificity: {intent['specificity']:.0%}")
+    with _buffered_output() as emit:
+        emit("\n" + "="*80)
+        emit("TEST 4: INTENT ANALYSIS")
+        emit("="*80)
+
+        analyzer = NaturalLanguageAnalyzer()
+
+        test_prompts = [
+            "Lightweight gripper for delicate items",
+            "Heavy-duty industrial robot arm",
+            "Cost-effective 3D printed bracket"
+        ]
+
+        for i, prompt in enumerate(test_prompts, 1):
+            emit(f"\n📝 Test {i}: {prompt}")
+            intent = analyzer.extract_intent(prompt)
+            emit(f"   • Device: {intent['detected_device_type']}")
+            emit(f"   • Goals: {', '.join(intent['optimization_goals'])}")
+            emit(f"   • Specificity: {intent['specificity']:.0%}")
 
 
 def test_knowledge_index():
     """Test knowledge index creation"""
-    print("\n" + "="*80)
-    print("TEST 5: KNOWLEDGE INDEX")
-    print("="*80)
-    
-    adapter = LLMDomainAdapter()
-    adapter.load_training_data()
-    index = adapter.create_knowledge_index()
-    
-    print(f"\n✓ Knowledge Categories: {len(index)}")
-    for category, items in sorted(index.items()):
-        print(f"\n   📚 {category.replace('_', ' ').title()} ({len(items)} items):")
-        for item in items[:3]:
-            print(f"      • {item[:70]}...")
+    with _buffered_output() as emit:
+        emit("\n" + "="*80)
+        emit("TEST 5: KNOWLEDGE INDEX")
+        emit("="*80)
+
+        adapter = _shared_adapter()
+        index = adapter.create_knowledge_index()
+
+        emit(f"\n✓ Knowledge Categories: {len(index)}")
+        for category, items in sorted(index.items()):
+            emit(f"\n   📚 {category.replace('_', ' ').title()} ({len(items)} items):")
+            for item in items[:3]:
+                emit(f"      • {item[:70]}...")
 
 
 async def run_all_tests():
@@ -141,41 +175,42 @@ async def run_all_tests():
     print("\n\n" + "█"*80)
     print("🧪 ROBOTCEM TRAINING INTEGRATION TESTS")
     print("█"*80)
-    
+
     try:
-        # Async tests
-        await test_domain_adapted_parsing()
-        
-        # Sync tests
-        test_domain_adapter_enhancement()
-        test_cem_training_data()
-        test_intent_analysis()
-        test_knowledge_index()
-        
+        # Tests are independent, so run them concurrently; the sync ones
+        # go to worker threads so their file I/O overlaps.
+        await asyncio.gather(
+            test_domain_adapted_parsing(),
+            asyncio.to_thread(test_domain_adapter_enhancement),
+            asyncio.to_thread(test_cem_training_data),
+            asyncio.to_thread(test_intent_analysis),
+            asyncio.to_thread(test_knowledge_index),
+        )
+
         print("\n\n" + "█"*80)
         print("✅ ALL TESTS COMPLETED SUCCESSFULLY")
         print("█"*80)
-        
+
         print("\n📊 SUMMARY:")
         print("   ✓ Domain-adapted prompt parsing")
         print("   ✓ LLM enhancement with training data")
         print("   ✓ CEM rule database access")
         print("   ✓ Intent analysis")
         print("   ✓ Knowledge indexing")
-        
+
         print("\n🎯 NEXT STEPS:")
         print("   1. Deploy trained models to production")
         print("   2. Monitor parsing accuracy")
         print("   3. Collect feedback for iterative improvement")
         print("   4. Expand training data with user examples")
         print("\n")
-        
+
     except Exception as e:
         print(f"\n❌ Test failed: {e}")
         import traceback
         traceback.print_exc()
         return False
-    
+
     return True
 
 
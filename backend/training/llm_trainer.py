@@ -5,16 +5,113 @@ Trains the LLM engine on domain-specific knowledge about robotics, CEM, and LEAP
 
 import json
 import asyncio
-from typing import Dict, List, Any, Optional, Tuple
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import heapq
+from typing import Dict, Iterable, List, Any, Optional, Tuple
 from pathlib import Path
 import logging
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 import hashlib
+import os
+import re
+import string
+import sys
+
+from backend.utils.atomic_write import atomic_writer
+from backend.utils.text_reader import read_text
+
+try:
+    import orjson
+except ImportError:  # optional; fall back to stdlib json
+    orjson = None
+
+try:
+    import ijson  # picks the C (yajl2_c) backend when available
+except ImportError:  # optional; fall back to loading the whole file
+    ijson = None
+
+try:
+    import ahocorasick
+except ImportError:  # optional; fall back to a compiled regex scan
+    ahocorasick = None
 
 logger = logging.getLogger(__name__)
 
+# Common robotics/CEM keywords
+_KEYWORDS = (
+    "gripper", "arm", "actuator", "bearing", "motor", "servo", "stepper",
+    "lattice", "weight", "optimization", "lightweight", "cost", "durable",
+    "3d print", "cnc", "fdm", "sla", "sls",
+    "basebox", "basesphere", "basecylinder", "basepipe", "baselens", "basering",
+    "picogk", "shapekernel", "leap71"
+)
+
+
+# Below this many knowledge items, scoring in plain Python beats building
+# the sparse item x keyword matrix
+_SPARSE_SCORING_MIN_ITEMS = 128
+
+_BASE_SYSTEM_PROMPT = """You are an expert robotics design engineer with deep knowledge of:
+- LEAP 71 ShapeKernel library and its 6 base shapes (Box, Sphere, Cylinder, Pipe, Lens, Ring)
+- LEAP 71 LatticeLibrary for weight optimization (BodyCentric, Octahedron lattices)
+- PicoGK geometry kernel for computational design
+- Robotics component selection and optimization
+- Manufacturing processes (FDM, SLA, SLS, CNC)
+- Computational Engineering Models (CEM) for design optimization
+
+Your responses are precise, technically accurate, and grounded in engineering best practices."""
+
+# Intent-specific system prompts; other intents get the base prompt
+_SYSTEM_PROMPTS = {
+    "design": _BASE_SYSTEM_PROMPT + "\nFocus on: geometry design, shape selection, and optimization strategies.",
+    "optimization": _BASE_SYSTEM_PROMPT + "\nFocus on: weight reduction, cost optimization, and performance tuning.",
+    "manufacturing": _BASE_SYSTEM_PROMPT + "\nFocus on: manufacturing constraints, tolerances, and material selection.",
+}
+
+
+# Keywords are pure ASCII, so folding ASCII case is all matching needs
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+
+def _lower_ascii(text: str) -> str:
+    """ASCII-lowercase text, skipping the copy when it is already lowercase"""
+    if text.isascii() and text.islower():
+        return text
+    return text.translate(_ASCII_LOWER)
+
+
+def _build_keyword_matcher():
+    """Compile _KEYWORDS into a single-pass multi-pattern matcher.
+    
+    Returns a function mapping lowercased text to the set of keywords it contains.
+    """
+    if ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for kw in _KEYWORDS:
+            automaton.add_word(kw, kw)
+        automaton.make_automaton()
+        return lambda text: {kw for _, kw in automaton.iter(text)}
+    
+    # Lookahead so overlapping keywords ("weight" inside "lightweight") are all found
+    alternatives = "|".join(map(re.escape, sorted(_KEYWORDS, key=len, reverse=True)))
+    pattern = re.compile(f"(?=({alternatives}))")
+    return lambda text: set(pattern.findall(text))
+
+
+_match_keywords = _build_keyword_matcher()
+
+
+def _read_book(path: Path) -> Optional[str]:
+    """Read a book text file, or None if it can't be read"""
+    try:
+        return read_text(path)
+    except Exception:
+        return None
+
 
-@dataclass
+@dataclass(slots=True)
 class TrainingExample:
     """Single training example for the LLM"""
     prompt: str
@@ -26,7 +123,39 @@ class TrainingExample:
     confidence: float = 0.95
     
     def to_dict(self) -> Dict:
-        return asdict(self)
+        # Flat schema, so no need for asdict()'s recursive deep copy
+        return {
+            "prompt": self.prompt,
+            "response": self.response,
+            "category": self.category,
+            "intent": self.intent,
+            "tags": self.tags,
+            "domain": self.domain,
+            "confidence": self.confidence
+        }
+
+
+def _item_fingerprint(item: Dict) -> Tuple[str, str, int, int]:
+    """Identity key of a knowledge item: category, title and the content's hash"""
+    # Books put whole texts in "content"; str hashes are computed once and cached
+    # on the string, so this stays cheap where serializing the item would not
+    content = item.get("content", "")
+    if not isinstance(content, str):
+        content = str(content)
+    return (str(item.get("category")), str(item.get("title")), len(content), hash(content))
+
+
+def _intern(value: Any) -> Any:
+    """sys.intern for strings; anything else (None, numbers) passes through"""
+    return sys.intern(value) if type(value) is str else value
+
+
+def _example_fingerprint(example: TrainingExample) -> int:
+    """64-bit fingerprint of an example's (prompt, response) pair"""
+    digest = hashlib.blake2b(
+        (example.prompt + "\x00" + example.response).encode("utf-8"), digest_size=8
+    ).digest()
+    return int.from_bytes(digest, "little")
 
 
 class LLMDomainAdapter:
@@ -39,29 +168,83 @@ class LLMDomainAdapter:
     3. Example-based learning
     """
     
+    # Category-specific prompt builders: (item, metadata) -> prompt.
+    # Other categories use the item title as the prompt.
+    _PROMPT_BUILDERS = {
+        "base_shape": lambda item, metadata: (
+            f"What is {metadata.get('shape', '')}? How is it used in robotics design?"
+        ),
+        "lattice_library": lambda item, metadata: (
+            f"Explain {metadata.get('type', '')} and its applications"
+        ),
+        "robotics": lambda item, metadata: (
+            f"What are the design rules for {item.get('domain', '')}?"
+        ),
+    }
+    
     def __init__(self):
         self.training_examples: List[TrainingExample] = []
+        # 64-bit (prompt, response) fingerprints of training_examples, for dedup on insert
+        self._example_fp: set[int] = set()
         self.knowledge_base: Dict[str, List[Dict]] = {}
         self.prompt_templates: Dict[str, str] = {}
         self.cache: Dict[str, str] = {}
+        # Keyword -> tag inverted index: postings of (item id, match count),
+        # built per keyword on first lookup and kept current on ingest
+        self._items_flat: List[Dict] = []
+        self._item_rank: List[Tuple[int, int]] = []
+        self._tags_lc: List[List[str]] = []
+        self._tag_index: Dict[str, List[Tuple[int, int]]] = {}
+        # (matrix, keyword -> column, item rank) built from _tag_index for large corpora
+        self._score_matrix: Optional[Tuple[Any, Dict[str, int], Any]] = None
+        # Identity keys of ingested items and (mtime_ns, size) of ingested
+        # book files, so reloading unchanged knowledge is a no-op
+        self._item_fps: set[Tuple[str, str, int, int]] = set()
+        self._book_stats: Dict[str, Tuple[int, int]] = {}
+        # Category -> "title [tags]" summaries for create_knowledge_index, kept current on ingest
+        self._summary_index: Dict[str, List[str]] = {}
+        # Per-instance LRU caches of query results; cleared when knowledge changes
+        self._enhance_cache = functools.lru_cache(maxsize=1024)(self._build_enhanced_prompt)
+        self._supporting_cache = functools.lru_cache(maxsize=1024)(self._build_supporting_knowledge)
         self.training_data_path = Path("backend/training/training_data.json")
         
     def load_training_data(self, data_path: Optional[str] = None) -> int:
-        """Load training data from JSON file"""
+        """Load training data from a JSON array file or a .jsonl file"""
         path = Path(data_path or self.training_data_path)
         
         if not path.exists():
             logger.warning(f"Training data not found at {path}")
             return 0
         
-        with open(path, 'r') as f:
-            data = json.load(f)
-        
-        for item in data:
-            self._process_training_item(item)
-        
-        logger.info(f"Loaded {len(data)} training items")
-        return len(data)
+        count = 0
+        if path.suffix == ".jsonl":
+            # One item per line; nothing beyond the current line is held in memory
+            loads = orjson.loads if orjson is not None else json.loads
+            with open(path, 'rb') as f:
+                for line in f:
+                    if line.strip():
+                        self._process_training_item(loads(line))
+                        count += 1
+        elif ijson is not None:
+            # Stream the top-level array one item at a time
+            with open(path, 'rb') as f:
+                for item in ijson.items(f, 'item', use_float=True):
+                    self._process_training_item(item)
+                    count += 1
+        else:
+            if orjson is not None:
+                with open(path, 'rb') as f:
+                    data = orjson.loads(f.read())
+            else:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            
+            for item in data:
+                self._process_training_item(item)
+            count = len(data)
+        
+        logger.info(f"Loaded {count} training items")
+        return count
 
     def load_books_folder(self, folder_path: str | Path = "books") -> int:
         """Load plain-text files from a folder (e.g., `books/`) into the knowledge base.
@@ -73,12 +256,27 @@ class LLMDomainAdapter:
         if not p.exists() or not p.is_dir():
             return 0
 
-        count = 0
+        paths = []
         for txt in sorted(p.glob("*.txt")):
             try:
-                with open(txt, 'r', encoding='utf-8') as f:
-                    content = f.read()
-            except Exception:
+                st = txt.stat()
+            except OSError:
+                continue
+            stat_key = (st.st_mtime_ns, st.st_size)
+            # Unchanged since we last ingested it; don't read it again
+            if self._book_stats.get(str(txt)) != stat_key:
+                paths.append((txt, stat_key))
+        if not paths:
+            return 0
+
+        # Reads are I/O bound, so overlap them across threads; processing
+        # stays serial and in sorted order below
+        with ThreadPoolExecutor(max_workers=min(32, len(paths))) as executor:
+            contents = list(executor.map(_read_book, (txt for txt, _ in paths)))
+
+        count = 0
+        for (txt, stat_key), content in zip(paths, contents):
+            if content is None:
                 # skip unreadable files
                 continue
 
@@ -92,85 +290,149 @@ class LLMDomainAdapter:
 
             # Reuse existing processing pipeline
             self._process_training_item(item)
+            self._book_stats[str(txt)] = stat_key
             count += 1
 
         return count
     
     def _process_training_item(self, item: Dict) -> None:
         """Process a training item and add to knowledge base"""
-        category = item.get("category", "general")
+        fp = _item_fingerprint(item)
+        if fp in self._item_fps:
+            # Identical item already ingested
+            return
+        self._item_fps.add(fp)
+        self._enhance_cache.cache_clear()
+        self._supporting_cache.cache_clear()
+        
+        category = _intern(item.get("category", "general"))
         
         if category not in self.knowledge_base:
             self.knowledge_base[category] = []
         
         self.knowledge_base[category].append(item)
+        self._index_item(item, category)
         
         # Create training examples for LLM
         if "content" in item:
             example = self._create_training_example(item)
-            self.training_examples.append(example)
+            fp = _example_fingerprint(example)
+            if fp not in self._example_fp:
+                self._example_fp.add(fp)
+                self.training_examples.append(example)
+    
+    def _index_item(self, item: Dict, category: str) -> None:
+        """Add a knowledge item to the flat item list and the keyword index"""
+        idx = len(self._items_flat)
+        self._items_flat.append(item)
+        # Rank reproduces knowledge_base iteration order for stable tie-breaking
+        category_pos = list(self.knowledge_base).index(category)
+        self._item_rank.append((category_pos, len(self.knowledge_base[category]) - 1))
+        self._score_matrix = None
+        self._summary_index.setdefault(category, []).append(
+            f"{item.get('title', '')} [{', '.join(map(str, item.get('tags', [])))}]"
+        )
+        
+        # Lowercase tags once at ingest instead of on every query; non-string
+        # tags can't match a keyword, so they stay out of the index
+        tags = [tag.lower() for tag in item.get("tags", []) if isinstance(tag, str)]
+        self._tags_lc.append(tags)
+        
+        if self._tag_index:
+            for kw, postings in self._tag_index.items():
+                matches = sum(1 for tag in tags if kw in tag)
+                if matches:
+                    postings.append((idx, matches))
+    
+    def _keyword_postings(self, kw: str) -> List[Tuple[int, int]]:
+        """Items whose tags contain keyword `kw`, with per-item match counts"""
+        postings = self._tag_index.get(kw)
+        if postings is None:
+            postings = []
+            for idx, tags in enumerate(self._tags_lc):
+                matches = sum(1 for tag in tags if kw in tag)
+                if matches:
+                    postings.append((idx, matches))
+            self._tag_index[kw] = postings
+            self._score_matrix = None
+        return postings
+    
+    def _rank_sparse(self, keywords: List[str], limit: Optional[int]) -> List[int]:
+        """Rank item ids with one sparse matrix-vector product (large corpora)"""
+        # Only needed once the corpus is large, so imported lazily
+        import numpy as np
+        from scipy.sparse import csr_matrix
+        
+        for kw in keywords:
+            self._keyword_postings(kw)
+        
+        if self._score_matrix is None:
+            vocab = {kw: col for col, kw in enumerate(self._tag_index)}
+            rows, cols, data = [], [], []
+            for kw, postings in self._tag_index.items():
+                col = vocab[kw]
+                for idx, matches in postings:
+                    rows.append(idx)
+                    cols.append(col)
+                    data.append(matches)
+            n_items = len(self._items_flat)
+            matrix = csr_matrix((data, (rows, cols)), shape=(n_items, len(vocab)), dtype=np.float64)
+            
+            # Position of each item in knowledge_base iteration order
+            category_pos, pos = np.array(self._item_rank, dtype=np.int64).T
+            rank = np.empty(n_items, dtype=np.int64)
+            rank[np.lexsort((pos, category_pos))] = np.arange(n_items)
+            self._score_matrix = (matrix, vocab, rank)
+        
+        matrix, vocab, rank = self._score_matrix
+        query = np.zeros(len(vocab))
+        for kw in keywords:
+            query[vocab[kw]] += 1.0
+        
+        scores = matrix @ query
+        hits = np.flatnonzero(scores)
+        # One integer key per hit: higher score first, then knowledge_base order
+        keys = rank[hits] - scores[hits].astype(np.int64) * len(rank)
+        if limit is not None and limit < len(hits):
+            top = np.argpartition(keys, limit)[:limit]
+            hits, keys = hits[top], keys[top]
+        return hits[np.argsort(keys)].tolist()
     
     def _create_training_example(self, item: Dict) -> TrainingExample:
         """Convert knowledge item to training example"""
-        category = item.get("category", "general")
-        title = item.get("title", "")
-        content = item.get("content", "")
-        metadata = item.get("metadata", {})
+        get = item.get
+        # Only a handful of distinct values recur across thousands of examples
+        category = _intern(get("category", "general"))
         
         # Create prompt-response pair
-        if category == "base_shape":
-            shape = metadata.get("shape", "")
-            prompt = f"What is {shape}? How is it used in robotics design?"
-            response = content
-        elif category == "lattice_library":
-            lattice_type = metadata.get("type", "")
-            prompt = f"Explain {lattice_type} and its applications"
-            response = content
-        elif category == "robotics":
-            domain = item.get("domain", "")
-            prompt = f"What are the design rules for {domain}?"
-            response = content
+        builder = self._PROMPT_BUILDERS.get(category)
+        if builder is not None:
+            prompt = builder(item, get("metadata", {}))
         else:
-            prompt = title
-            response = content
+            prompt = get("title", "")
         
         return TrainingExample(
             prompt=prompt,
-            response=response,
+            response=get("content", ""),
             category=category,
-            intent=item.get("intent", "general"),
-            tags=item.get("tags", []),
-            domain=item.get("domain", "robotics")
+            intent=_intern(get("intent", "general")),
+            tags=[_intern(tag) for tag in get("tags", [])],
+            domain=_intern(get("domain", "robotics"))
         )
     
     def create_system_prompt(self, intent: str = "design") -> str:
         """Create enhanced system prompt with domain knowledge"""
-        base_prompt = """You are an expert robotics design engineer with deep knowledge of:
-- LEAP 71 ShapeKernel library and its 6 base shapes (Box, Sphere, Cylinder, Pipe, Lens, Ring)
-- LEAP 71 LatticeLibrary for weight optimization (BodyCentric, Octahedron lattices)
-- PicoGK geometry kernel for computational design
-- Robotics component selection and optimization
-- Manufacturing processes (FDM, SLA, SLS, CNC)
-- Computational Engineering Models (CEM) for design optimization
-
-Your responses are precise, technically accurate, and grounded in engineering best practices."""
-
-        if intent == "design":
-            return base_prompt + "\nFocus on: geometry design, shape selection, and optimization strategies."
-        elif intent == "optimization":
-            return base_prompt + "\nFocus on: weight reduction, cost optimization, and performance tuning."
-        elif intent == "manufacturing":
-            return base_prompt + "\nFocus on: manufacturing constraints, tolerances, and material selection."
-        else:
-            return base_prompt
+        # Prompts depend only on intent, so they are built once at import time
+        return _SYSTEM_PROMPTS.get(intent, _BASE_SYSTEM_PROMPT)
     
     def enhance_prompt_with_context(self, user_prompt: str, intent: str = "design") -> str:
         """Enhance user prompt with relevant domain context"""
-        # Extract intent keywords
-        keywords = self._extract_keywords(user_prompt)
-        
-        # Find relevant knowledge items
-        relevant_knowledge = self._find_relevant_knowledge(keywords)
+        return self._enhance_cache(user_prompt, intent)
+    
+    def _build_enhanced_prompt(self, user_prompt: str, intent: str) -> str:
+        """Uncached body of enhance_prompt_with_context"""
+        # Find knowledge items relevant to the prompt's keywords
+        relevant_knowledge = self._relevant_for_text(user_prompt, limit=3)
         
         if not relevant_knowledge:
             return user_prompt
@@ -186,39 +448,35 @@ Your responses are precise, technically accurate, and grounded in engineering be
     
     def _extract_keywords(self, text: str) -> List[str]:
         """Extract relevant keywords from text"""
-        # Common robotics/CEM keywords
-        keywords_list = [
-            "gripper", "arm", "actuator", "bearing", "motor", "servo", "stepper",
-            "lattice", "weight", "optimization", "lightweight", "cost", "durable",
-            "3d print", "cnc", "fdm", "sla", "sls",
-            "basebox", "basesphere", "basecylinder", "basepipe", "baselens", "basering",
-            "picogk", "shapekernel", "leap71"
-        ]
-        
-        text_lower = text.lower()
-        found_keywords = []
-        
-        for keyword in keywords_list:
-            if keyword in text_lower:
-                found_keywords.append(keyword)
-        
-        return found_keywords
-    
-    def _find_relevant_knowledge(self, keywords: List[str]) -> List[Dict]:
-        """Find knowledge items matching keywords"""
-        relevant = []
-        
-        for category, items in self.knowledge_base.items():
-            for item in items:
-                item_tags = item.get("tags", [])
-                matches = sum(1 for kw in keywords for tag in item_tags if kw.lower() in tag.lower())
-                
-                if matches > 0:
-                    relevant.append((item, matches))
-        
-        # Sort by match count descending
-        relevant.sort(key=lambda x: x[1], reverse=True)
-        return [item for item, _ in relevant]
+        found = _match_keywords(_lower_ascii(text))
+        return [keyword for keyword in _KEYWORDS if keyword in found]
+    
+    def _find_relevant_knowledge(self, keywords: List[str], limit: Optional[int] = None) -> List[Dict]:
+        """Find knowledge items matching keywords, best first (at most `limit`)"""
+        return self._rank_knowledge([kw.lower() for kw in keywords], limit)
+    
+    def _relevant_for_text(self, text: str, limit: Optional[int] = None) -> List[Dict]:
+        """Find knowledge relevant to free text in one pass: keyword matches feed scoring directly"""
+        # Matches are already lowercase and unique, so no ordered keyword list is built
+        return self._rank_knowledge(_match_keywords(_lower_ascii(text)), limit)
+    
+    def _rank_knowledge(self, keywords: Iterable[str], limit: Optional[int]) -> List[Dict]:
+        """Score knowledge items against lowercase keywords and return the best first"""
+        if len(self._items_flat) >= _SPARSE_SCORING_MIN_ITEMS:
+            ranked = self._rank_sparse(list(keywords), limit)
+        else:
+            scores = Counter()
+            for kw in keywords:
+                for idx, matches in self._keyword_postings(kw):
+                    scores[idx] += matches
+            
+            # Sort by match count descending
+            sort_key = lambda idx: (-scores[idx], self._item_rank[idx])
+            if limit is not None:
+                ranked = heapq.nsmallest(limit, scores, key=sort_key)
+            else:
+                ranked = sorted(scores, key=sort_key)
+        return [self._items_flat[idx] for idx in ranked]
     
     def generate_training_prompts(self) -> List[Tuple[str, str]]:
         """Generate prompt-response pairs from knowledge base for training"""
@@ -279,22 +537,25 @@ Your responses are precise, technically accurate, and grounded in engineering be
         """Save training examples to file, deduplicating by prompt+response pair"""
         Path(output_path).parent.mkdir(parents=True, exist_ok=True)
         
-        # Deduplicate examples by (prompt, response) pair to avoid duplicates on repeated runs
-        seen = set()
-        unique_examples = []
-        for ex in self.training_examples:
-            key = (ex.prompt, ex.response)
-            if key not in seen:
-                seen.add(key)
-                unique_examples.append(ex)
-        
-        examples_data = [ex.to_dict() for ex in unique_examples]
+        # training_examples is already deduplicated by (prompt, response) on insert
+        if orjson is not None:
+            # orjson serializes the dataclasses directly, no to_dict() pass
+            encode = lambda ex: orjson.dumps(ex, option=orjson.OPT_INDENT_2)
+        else:
+            encode = lambda ex: json.dumps(ex.to_dict(), indent=2).encode('utf-8')
         
-        with open(output_path, 'w') as f:
-            json.dump(examples_data, f, indent=2)
+        # Stream one example at a time, laid out as json.dump(..., indent=2) would
+        # (raw newlines only occur between tokens, so re-indenting is safe)
+        with atomic_writer(output_path) as f:
+            f.write(b'[')
+            for i, ex in enumerate(self.training_examples):
+                f.write(b',\n  ' if i else b'\n  ')
+                f.write(encode(ex).replace(b'\n', b'\n  '))
+            f.write(b'\n]' if self.training_examples else b']')
         
-        logger.info(f"Saved {len(examples_data)} training examples (deduplicated) to {output_path}")
-        return len(examples_data)
+        num_examples = len(self.training_examples)
+        logger.info(f"Saved {num_examples} training examples (deduplicated) to {output_path}")
+        return num_examples
     
     def create_retrieval_augmented_response(
         self, 
@@ -302,14 +563,22 @@ Your responses are precise, technically accurate, and grounded in engineering be
         llm_response: str
     ) -> str:
         """Enhance LLM response with retrieval-augmented generation (RAG)"""
-        keywords = self._extract_keywords(user_prompt)
-        relevant_knowledge = self._find_relevant_knowledge(keywords)
+        # The supporting knowledge depends only on the prompt, so that's what is cached
+        supporting = self._supporting_cache(user_prompt)
+        if not supporting:
+            return llm_response
+        
+        return llm_response + supporting
+    
+    def _build_supporting_knowledge(self, user_prompt: str) -> str:
+        """Supporting-knowledge suffix for a RAG response, or "" if nothing matches"""
+        relevant_knowledge = self._relevant_for_text(user_prompt, limit=2)
         
         if not relevant_knowledge:
-            return llm_response
+            return ""
         
         # Add knowledge to response
-        response_parts = [llm_response, "\n\n📚 **Supporting Knowledge:**"]
+        response_parts = ["", "\n\n📚 **Supporting Knowledge:**"]
         
         for item in relevant_knowledge[:2]:
             title = item.get("title", "")
@@ -320,16 +589,9 @@ Your responses are precise, technically accurate, and grounded in engineering be
     
     def create_knowledge_index(self) -> Dict[str, List[str]]:
         """Create searchable index of all knowledge"""
-        index = {}
-        
-        for category, items in self.knowledge_base.items():
-            index[category] = []
-            for item in items:
-                title = item.get("title", "")
-                tags = item.get("tags", [])
-                index[category].append(f"{title} [{', '.join(tags)}]")
-        
-        return index
+        # Summaries are built as items are ingested; hand out copies so callers
+        # can't modify the maintained index
+        return {category: list(entries) for category, entries in self._summary_index.items()}
 
 
 class CEMTrainer:
@@ -474,50 +736,45 @@ class CEMTrainer:
         
         data = self.get_cem_training_data()
         
-        with open(output_path, 'w') as f:
-            json.dump(data, f, indent=2)
+        with atomic_writer(output_path) as f:
+            if orjson is not None:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+            else:
+                f.write(json.dumps(data, indent=2).encode('utf-8'))
         
         logger.info(f"Saved CEM training data to {output_path}")
 
 
-async def train_systems(
-    data_path: Optional[str] = None,
-    output_dir: str = "backend/training"
-) -> Dict[str, Any]:
-    """
-    Complete training pipeline for LLM and CEM engines.
-    """
-    logger.info("=" * 70)
-    logger.info("STARTING UNIFIED TRAINING PIPELINE")
-    logger.info("=" * 70)
+def _train_llm(data_path: Optional[str], output_dir: str) -> Dict[str, Any]:
+    """LLM branch of the training pipeline"""
+    results = {}
     
-    results = {
-        "llm_training": {},
-        "cem_training": {},
-        "timestamps": {}
-    }
-    
-    # LLM Training
     logger.info("\n1️⃣  Initializing LLM Domain Adapter...")
     llm_adapter = LLMDomainAdapter()
     
     logger.info("2️⃣  Loading training data...")
     num_items = llm_adapter.load_training_data(data_path)
-    results["llm_training"]["knowledge_items_loaded"] = num_items
+    results["knowledge_items_loaded"] = num_items
     
     logger.info("3️⃣  Generating training examples...")
     examples = llm_adapter.generate_training_prompts()
     num_examples = llm_adapter.save_training_examples(
         f"{output_dir}/llm_training_examples.json"
     )
-    results["llm_training"]["training_examples"] = num_examples
+    results["training_examples"] = num_examples
     
     logger.info("4️⃣  Creating knowledge index...")
     index = llm_adapter.create_knowledge_index()
     logger.info(f"   Knowledge categories: {list(index.keys())}")
-    results["llm_training"]["knowledge_categories"] = list(index.keys())
+    results["knowledge_categories"] = list(index.keys())
+    
+    return results
+
+
+def _train_cem(output_dir: str) -> Dict[str, Any]:
+    """CEM branch of the training pipeline"""
+    results = {}
     
-    # CEM Training
     logger.info("\n5️⃣  Initializing CEM Trainer...")
     cem_trainer = CEMTrainer()
     
@@ -530,9 +787,37 @@ async def train_systems(
     cem_trainer.save_cem_training(f"{output_dir}/cem_rules.json")
     
     cem_data = cem_trainer.get_cem_training_data()
-    results["cem_training"]["design_rule_categories"] = list(cem_data["design_rules"].keys())
-    results["cem_training"]["manufacturing_processes"] = list(cem_data["manufacturing_rules"].keys())
-    results["cem_training"]["materials"] = list(cem_data["material_database"].keys())
+    results["design_rule_categories"] = list(cem_data["design_rules"].keys())
+    results["manufacturing_processes"] = list(cem_data["manufacturing_rules"].keys())
+    results["materials"] = list(cem_data["material_database"].keys())
+    
+    return results
+
+
+async def train_systems(
+    data_path: Optional[str] = None,
+    output_dir: str = "backend/training"
+) -> Dict[str, Any]:
+    """
+    Complete training pipeline for LLM and CEM engines.
+    
+    The LLM and CEM branches are independent, so they run concurrently in
+    worker threads.
+    """
+    logger.info("=" * 70)
+    logger.info("STARTING UNIFIED TRAINING PIPELINE")
+    logger.info("=" * 70)
+    
+    llm_results, cem_results = await asyncio.gather(
+        asyncio.to_thread(_train_llm, data_path, output_dir),
+        asyncio.to_thread(_train_cem, output_dir),
+    )
+    
+    results = {
+        "llm_training": llm_results,
+        "cem_training": cem_results,
+        "timestamps": {}
+    }
     
     logger.info("\n" + "=" * 70)
     logger.info("✅ TRAINING COMPLETE")
@@ -10,12 +10,389 @@ This module:
 
 import json
 import asyncio
+import copy
+import functools
+import re
+import string
+import sys
 from typing import Dict, List, Any, Tuple
 from pathlib import Path
+from types import MappingProxyType
 from backend.training.llm_trainer import LLMDomainAdapter, CEMTrainer
+from backend.utils.atomic_write import atomic_writer
 from backend.picogk_bridge.geometry_extractor import GeometryKnowledgeExtractor
 from backend.picogk_bridge.picogk_bridge import PicoGKBridge
 
+try:
+    import orjson
+except ImportError:  # optional; fall back to stdlib json
+    orjson = None
+
+try:
+    import ahocorasick
+except ImportError:  # optional; fall back to a compiled regex scan
+    ahocorasick = None
+
+
+# Intent keywords grouped by the spec rule they trigger
+_INTENT_KEYWORDS = {
+    'box': ('box', 'rectangular', 'housing'),
+    'cylinder': ('cylinder', 'tube', 'pipe'),
+    'lattice': ('lattice', 'infill', 'structure'),
+    'lightweight': ('lightweight', 'light', 'weight'),
+    'strong': ('strong', 'durable', 'load'),
+    'fdm': ('fdm', '3d', 'print'),
+    'sla': ('sla', 'resin'),
+    'cnc': ('cnc', 'precision', 'aluminum'),
+}
+
+
+# Characters that make up a word for keyword matching
+_WORD_CHARS = frozenset(string.ascii_lowercase + string.digits)
+
+
+def _build_intent_matcher():
+    """Compile _INTENT_KEYWORDS into a single-pass multi-pattern matcher.
+    
+    Keywords only count at the start of a word, so inflections still match
+    ("printing", "boxes", "stronger") but embedded hits don't ("translate"
+    is not SLA, "download" is not a load).
+    Returns a function mapping lowercased text to the set of rule groups it hits.
+    """
+    groups = {kw: group for group, kws in _INTENT_KEYWORDS.items() for kw in kws}
+    
+    if ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for kw, group in groups.items():
+            automaton.add_word(kw, (group, len(kw)))
+        automaton.make_automaton()
+        
+        def match(text: str) -> set:
+            found = set()
+            for end, (group, length) in automaton.iter(text):
+                start = end - length + 1
+                if start == 0 or text[start - 1] not in _WORD_CHARS:
+                    found.add(group)
+            return found
+        
+        return match
+    
+    # Lookahead so overlapping keywords are all found; keywords sharing a
+    # start position ("light"/"lightweight") belong to the same group
+    alternatives = "|".join(map(re.escape, sorted(groups, key=len, reverse=True)))
+    pattern = re.compile(f"(?<![a-z0-9])(?=({alternatives}))")
+    return lambda text: {groups[kw] for kw in pattern.findall(text)}
+
+
+_match_intent = _build_intent_matcher()
+
+
+if orjson is not None:
+    # Extracted knowledge can carry numpy scalars/arrays and non-string keys
+    _ORJSON_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+    
+    def _encode(obj: Any) -> bytes:
+        """Serialize one value the way json.dump(..., indent=2) lays it out"""
+        return orjson.dumps(obj, option=_ORJSON_OPTIONS)
+else:
+    def _encode(obj: Any) -> bytes:
+        """Serialize one value the way json.dump(..., indent=2) lays it out"""
+        return json.dumps(obj, indent=2).encode('utf-8')
+
+
+# Geometry system prompts, built once and shared read-only by every trainer
+_SYSTEM_PROMPTS = MappingProxyType({
+    'geometry_interpreter': """
+You are a computational geometry interpreter for CAD/3D printing.
+When a user describes what they want to make, identify:
+
+1. BASE SHAPE: Which geometric primitive (Box, Sphere, Cylinder, Pipe, Lens, Ring)?
+2. PARAMETERS: Specific dimensions (length, width, height, radius, etc.)
+3. OPTIMIZATION: Any optimization goal (lightweight, strong, precise)?
+4. MANUFACTURING: Any manufacturing process constraint (FDM, SLA, SLS, CNC)?
+5. LATTICE: Should internal structure be optimized with lattice?
+
+GEOMETRY VOCABULARY:
+- BaseBox: Rectangular geometry with customizable dimensions
+- BaseSphere: Spherical geometry, good for connectors
+- BaseCylinder: Cylindrical structures, used for axes and pins
+- BasePipe: Hollow cylindrical structures
+- BaseLens: Optical components with curved surfaces
+- BaseRing: Toroidal (doughnut) geometry
+- Lattice: Internal beam structure for weight optimization
+  - BodyCentric: Balanced strength/weight (20-30% lighter)
+  - Octahedron: High strength-to-weight (25-35% lighter)
+  - Conformal: Adapts to complex shapes, boundary-reinforced
+
+MANUFACTURING CONSTRAINTS:
+- FDM: Minimum wall 0.8mm, tolerance ±0.3mm
+- SLA: Minimum wall 0.4mm, tolerance ±0.1mm
+- SLS: Minimum wall 0.7mm, tolerance ±0.2mm
+- CNC: Minimum wall 0.5mm, tolerance ±0.05mm
+
+Always output in this format:
+{
+  "shape_type": "...",
+  "parameters": {...},
+  "optimization": "...",
+  "manufacturing": "...",
+  "lattice_config": {...} or null
+}
+    """,
+    
+    'lattice_optimizer': """
+You understand lattice optimization for 3D printing.
+Given a shape and goal, recommend the best lattice configuration:
+
+- LIGHTWEIGHT: Use BodyCentric with larger cells (25mm) = 20-30% weight reduction
+- STRONG: Use Octahedron with thicker beams (3-5mm radius)
+- ADAPTIVE: Use ConformalCellArray for complex shapes
+- BALANCED: Use BodyCentric with medium beam thickness (1-2mm)
+
+Consider manufacturing process:
+- FDM: Minimum beam 0.8mm, can handle 0.8-4mm beams
+- SLA: Minimum beam 0.4mm, precise up to 0.4-2mm
+- SLS: Minimum beam 0.7mm, robust 0.7-5mm
+- CNC: Tight tolerances, beams 0.5-8mm for metals
+
+Output JSON with complete lattice_config.
+    """
+})
+
+
+# Numeric geometry parameters exposed as columns by training_table()
+_NUMERIC_FIELDS = (
+    'length', 'width', 'height', 'radius', 'bounding_radius',
+    'cell_size', 'noise_level', 'min_beam_thickness', 'max_beam_thickness',
+)
+
+
+# Canonical geometry examples; generate_training_examples() hands out copies
+_TRAINING_EXAMPLES: Tuple[Dict[str, Any], ...] = (
+    # Example 1: Box creation from intent
+    {
+        'intent': 'Create a rectangular housing 20mm long, 10mm wide, 15mm high',
+        'understood_as': 'BaseBox with dimensions [20, 10, 15]',
+        'geometry_spec': {
+            'shape_type': 'box',
+            'parameters': {'length': 20, 'width': 10, 'height': 15},
+            'position': {'x': 0, 'y': 0, 'z': 0}
+        },
+        'expected_properties': {
+            'volume': 3000,  # mm³
+            'voxel_construct_available': True
+        }
+    },
+    
+    # Example 2: Sphere creation
+    {
+        'intent': 'Design a spherical connector head with 40mm radius',
+        'understood_as': 'BaseSphere with radius 40mm',
+        'geometry_spec': {
+            'shape_type': 'sphere',
+            'parameters': {'radius': 40},
+            'position': {'x': 0, 'y': 0, 'z': 0}
+        },
+        'expected_properties': {
+            'radius': 40,
+            'surface_modulation_capable': True
+        }
+    },
+    
+    # Example 3: Lightweight optimization with lattice
+    {
+        'intent': 'Create a lightweight infill structure inside a sphere, reduce weight by 30%',
+        'understood_as': 'Lattice with BodyCentric pattern, cell size 20mm, noise 0.2',
+        'geometry_spec': {
+            'shape_type': 'lattice',
+            'parameters': {'bounding_radius': 50},
+            'lattice_config': {
+                'lattice_type': 'BodyCentric',
+                'cell_size': 20,
+                'noise_level': 0.2,
+                'min_beam_thickness': 1.0,
+                'max_beam_thickness': 4.0
+            }
+        },
+        'expected_properties': {
+            'weight_reduction': '20-30%',
+            'strength_maintained': True,
+            'voxel_based': True
+        }
+    },
+    
+    # Example 4: High-strength lattice
+    {
+        'intent': 'Create a strong, durable lattice structure for load-bearing',
+        'understood_as': 'Octahedron lattice, larger beam radius 3-5mm',
+        'geometry_spec': {
+            'shape_type': 'lattice',
+            'parameters': {'bounding_radius': 50},
+            'lattice_config': {
+                'lattice_type': 'OctahedronLattice',
+                'cell_size': 20,
+                'min_beam_thickness': 2.0,
+                'max_beam_thickness': 5.0
+            }
+        },
+        'expected_properties': {
+            'high_strength': True,
+            'weight_reduction': '25-35%',
+            'best_for': 'aerospace components'
+        }
+    },
+    
+    # Example 5: Conformal lattice
+    {
+        'intent': 'Create a lattice that adapts to surface boundaries, stronger at edges',
+        'understood_as': 'Conformal cell array with boundary reinforcement',
+        'geometry_spec': {
+            'shape_type': 'lattice',
+            'lattice_config': {
+                'cell_array': 'ConformalCellArray',
+                'lattice_type': 'BodyCentric',
+                'cell_size': 20,
+                'boundary_offset': 5
+            }
+        },
+        'expected_properties': {
+            'adaptive_geometry': True,
+            'boundary_reinforced': True,
+            'complex_shapes': True
+        }
+    },
+    
+    # Example 6: Modulated shape
+    {
+        'intent': 'Create a tapered cylinder that gets narrower towards the top',
+        'understood_as': 'BaseCylinder with LineModulation applied',
+        'geometry_spec': {
+            'shape_type': 'cylinder',
+            'parameters': {'radius': 20, 'height': 40},
+            'modulation': {
+                'type': 'LineModulation',
+                'function': 'tapered'
+            }
+        },
+        'expected_properties': {
+            'varying_cross_section': True,
+            'optimized_stress_distribution': True
+        }
+    },
+    
+    # Example 7: Manufacturing constraint awareness
+    {
+        'intent': 'Create a lattice structure suitable for FDM 3D printing',
+        'understood_as': 'Lattice with minimum beam thickness 0.8mm (FDM extrusion width)',
+        'geometry_spec': {
+            'shape_type': 'lattice',
+            'lattice_config': {
+                'lattice_type': 'BodyCentric',
+                'min_beam_thickness': 0.8,  # FDM minimum
+                'max_beam_thickness': 4.0,
+                'manufacturing_process': 'FDM'
+            }
+        },
+        'manufacturing_rules': {
+            'process': 'FDM',
+            'min_wall_thickness': 0.8,
+            'tolerance': 0.3
+        }
+    },
+    
+    # Example 8: Material-aware design
+    {
+        'intent': 'Create a strong aerospace component in aluminum with high precision',
+        'understood_as': 'Octahedron lattice with tight tolerances',
+        'geometry_spec': {
+            'shape_type': 'lattice',
+            'lattice_config': {
+                'lattice_type': 'OctahedronLattice',
+                'precision': 'high'
+            }
+        },
+        'material_constraints': {
+            'material': 'Al6061',
+            'tensile_strength': 310,  # MPa
+            'density': 2.70,  # g/cm³
+            'cost': 8  # $/kg
+        }
+    },
+)
+
+
+@functools.lru_cache(maxsize=4096)
+def _interpret_cached(intent_lower: str) -> Tuple:
+    """Keyword-match a normalized intent into an immutable spec tuple.
+
+    Returns (shape_type, parameter items, optimization, manufacturing,
+    lattice_config items or None) so results can be shared from the cache.
+    """
+    
+    # In production, would use actual LLM with system prompt
+    # For now, simple pattern matching
+    
+    matched = _match_intent(intent_lower)
+    
+    spec = {
+        'shape_type': 'sphere',
+        'parameters': {'radius': 40},
+        'optimization': None,
+        'manufacturing': None,
+        'lattice_config': None
+    }
+    
+    # Shape detection
+    if 'box' in matched:
+        spec['shape_type'] = 'box'
+        spec['parameters'] = {'length': 20, 'width': 10, 'height': 15}
+    
+    elif 'cylinder' in matched:
+        spec['shape_type'] = 'cylinder'
+        spec['parameters'] = {'radius': 20, 'height': 40}
+    
+    elif 'lattice' in matched:
+        spec['shape_type'] = 'lattice'
+        spec['lattice_config'] = {'lattice_type': 'BodyCentric', 'cell_size': 20}
+    
+    # Optimization detection
+    if 'lightweight' in matched:
+        spec['optimization'] = 'lightweight'
+        if spec['shape_type'] == 'lattice':
+            spec['lattice_config']['lattice_type'] = 'BodyCentric'
+            spec['lattice_config']['cell_size'] = 25
+    
+    if 'strong' in matched:
+        spec['optimization'] = 'strong'
+        if spec['shape_type'] == 'lattice':
+            spec['lattice_config']['lattice_type'] = 'OctahedronLattice'
+            spec['lattice_config']['beam_radius'] = 4.0
+    
+    # Manufacturing detection
+    if 'fdm' in matched:
+        spec['manufacturing'] = 'FDM'
+        if spec['shape_type'] == 'lattice':
+            spec['lattice_config']['min_beam_thickness'] = 0.8
+    
+    if 'sla' in matched:
+        spec['manufacturing'] = 'SLA'
+        if spec['shape_type'] == 'lattice':
+            spec['lattice_config']['min_beam_thickness'] = 0.4
+    
+    if 'cnc' in matched:
+        spec['manufacturing'] = 'CNC'
+        spec['optimization'] = 'strong'
+    
+    lattice_config = spec['lattice_config']
+    return (
+        spec['shape_type'],
+        tuple(spec['parameters'].items()),
+        spec['optimization'],
+        spec['manufacturing'],
+        tuple(lattice_config.items()) if lattice_config is not None else None,
+    )
+
+
 
 class RealGeometryTrainer:
     """Train on actual geometry operations and parameters."""
@@ -47,7 +424,7 @@ class RealGeometryTrainer:
         for shape_name, shape_info in self.geometry_knowledge.get('base_shapes', {}).items():
             items.append({
                 'type': 'base_shape',
-                'name': shape_name,
+                'name': sys.intern(shape_name),
                 'description': shape_info.get('description', ''),
                 'parameters': shape_info.get('parameters', {}),
                 'use_cases': shape_info.get('use_cases', []),
@@ -58,7 +435,7 @@ class RealGeometryTrainer:
         for lattice_name, lattice_info in self.geometry_knowledge.get('lattice_patterns', {}).items():
             items.append({
                 'type': 'lattice',
-                'name': lattice_name,
+                'name': sys.intern(lattice_name),
                 'description': lattice_info.get('properties', ''),
                 'parameters': lattice_info.get('parameters', {}),
                 'use_cases': lattice_info.get('use_cases', []),
@@ -70,160 +447,32 @@ class RealGeometryTrainer:
     def generate_training_examples(self) -> List[Dict[str, Any]]:
         """Generate training examples from geometry knowledge."""
         
-        examples = []
-        
-        # Example 1: Box creation from intent
-        examples.append({
-            'intent': 'Create a rectangular housing 20mm long, 10mm wide, 15mm high',
-            'understood_as': 'BaseBox with dimensions [20, 10, 15]',
-            'geometry_spec': {
-                'shape_type': 'box',
-                'parameters': {'length': 20, 'width': 10, 'height': 15},
-                'position': {'x': 0, 'y': 0, 'z': 0}
-            },
-            'expected_properties': {
-                'volume': 3000,  # mm³
-                'voxel_construct_available': True
-            }
-        })
-        
-        # Example 2: Sphere creation
-        examples.append({
-            'intent': 'Design a spherical connector head with 40mm radius',
-            'understood_as': 'BaseSphere with radius 40mm',
-            'geometry_spec': {
-                'shape_type': 'sphere',
-                'parameters': {'radius': 40},
-                'position': {'x': 0, 'y': 0, 'z': 0}
-            },
-            'expected_properties': {
-                'radius': 40,
-                'surface_modulation_capable': True
-            }
-        })
-        
-        # Example 3: Lightweight optimization with lattice
-        examples.append({
-            'intent': 'Create a lightweight infill structure inside a sphere, reduce weight by 30%',
-            'understood_as': 'Lattice with BodyCentric pattern, cell size 20mm, noise 0.2',
-            'geometry_spec': {
-                'shape_type': 'lattice',
-                'parameters': {'bounding_radius': 50},
-                'lattice_config': {
-                    'lattice_type': 'BodyCentric',
-                    'cell_size': 20,
-                    'noise_level': 0.2,
-                    'min_beam_thickness': 1.0,
-                    'max_beam_thickness': 4.0
-                }
-            },
-            'expected_properties': {
-                'weight_reduction': '20-30%',
-                'strength_maintained': True,
-                'voxel_based': True
-            }
-        })
-        
-        # Example 4: High-strength lattice
-        examples.append({
-            'intent': 'Create a strong, durable lattice structure for load-bearing',
-            'understood_as': 'Octahedron lattice, larger beam radius 3-5mm',
-            'geometry_spec': {
-                'shape_type': 'lattice',
-                'parameters': {'bounding_radius': 50},
-                'lattice_config': {
-                    'lattice_type': 'OctahedronLattice',
-                    'cell_size': 20,
-                    'min_beam_thickness': 2.0,
-                    'max_beam_thickness': 5.0
-                }
-            },
-            'expected_properties': {
-                'high_strength': True,
-                'weight_reduction': '25-35%',
-                'best_for': 'aerospace components'
-            }
-        })
-        
-        # Example 5: Conformal lattice
-        examples.append({
-            'intent': 'Create a lattice that adapts to surface boundaries, stronger at edges',
-            'understood_as': 'Conformal cell array with boundary reinforcement',
-            'geometry_spec': {
-                'shape_type': 'lattice',
-                'lattice_config': {
-                    'cell_array': 'ConformalCellArray',
-                    'lattice_type': 'BodyCentric',
-                    'cell_size': 20,
-                    'boundary_offset': 5
-                }
-            },
-            'expected_properties': {
-                'adaptive_geometry': True,
-                'boundary_reinforced': True,
-                'complex_shapes': True
-            }
-        })
-        
-        # Example 6: Modulated shape
-        examples.append({
-            'intent': 'Create a tapered cylinder that gets narrower towards the top',
-            'understood_as': 'BaseCylinder with LineModulation applied',
-            'geometry_spec': {
-                'shape_type': 'cylinder',
-                'parameters': {'radius': 20, 'height': 40},
-                'modulation': {
-                    'type': 'LineModulation',
-                    'function': 'tapered'
-                }
-            },
-            'expected_properties': {
-                'varying_cross_section': True,
-                'optimized_stress_distribution': True
-            }
-        })
-        
-        # Example 7: Manufacturing constraint awareness
-        examples.append({
-            'intent': 'Create a lattice structure suitable for FDM 3D printing',
-            'understood_as': 'Lattice with minimum beam thickness 0.8mm (FDM extrusion width)',
-            'geometry_spec': {
-                'shape_type': 'lattice',
-                'lattice_config': {
-                    'lattice_type': 'BodyCentric',
-                    'min_beam_thickness': 0.8,  # FDM minimum
-                    'max_beam_thickness': 4.0,
-                    'manufacturing_process': 'FDM'
-                }
-            },
-            'manufacturing_rules': {
-                'process': 'FDM',
-                'min_wall_thickness': 0.8,
-                'tolerance': 0.3
-            }
-        })
-        
-        # Example 8: Material-aware design
-        examples.append({
-            'intent': 'Create a strong aerospace component in aluminum with high precision',
-            'understood_as': 'Octahedron lattice with tight tolerances',
-            'geometry_spec': {
-                'shape_type': 'lattice',
-                'lattice_config': {
-                    'lattice_type': 'OctahedronLattice',
-                    'precision': 'high'
-                }
-            },
-            'material_constraints': {
-                'material': 'Al6061',
-                'tensile_strength': 310,  # MPa
-                'density': 2.70,  # g/cm³
-                'cost': 8  # $/kg
-            }
-        })
-        
-        self.training_data = examples
-        return examples
+        # Nested specs are plain dicts, so copy all the way down: editing one
+        # trainer's examples must not change the next trainer's
+        self.training_data = copy.deepcopy(list(_TRAINING_EXAMPLES))
+        return self.training_data
+    
+    def training_table(self):
+        """Columnar view of the examples' geometry parameters.
+        
+        Returns a NumPy structured array with one row per training example: a
+        `shape_type` column plus a float column per entry in _NUMERIC_FIELDS (NaN
+        where an example doesn't set it), so numeric filtering is a single
+        vectorized scan, e.g. `table[table['shape_type'] == 'lattice']`.
+        """
+        # Only needed by numeric consumers, so imported lazily
+        import numpy as np
+        
+        dtype = [('shape_type', 'U16')] + [(name, 'f8') for name in _NUMERIC_FIELDS]
+        table = np.full(len(self.training_data), np.nan, dtype=dtype)
+        for row, example in enumerate(self.training_data):
+            spec = example.get('geometry_spec', {})
+            values = {**spec.get('parameters', {}), **spec.get('lattice_config', {})}
+            table['shape_type'][row] = spec.get('shape_type', '')
+            for name in _NUMERIC_FIELDS:
+                if name in values:
+                    table[name][row] = values[name]
+        return table
     
     def save_training_data(self, output_path: str) -> None:
         """Save training data to JSON."""
@@ -231,16 +480,26 @@ class RealGeometryTrainer:
         output_file = Path(output_path)
         output_file.parent.mkdir(parents=True, exist_ok=True)
         
-        training_dict = {
+        header = {
             'version': '2.0',
             'type': 'real_geometry_training',
-            'extraction_source': 'LEAP71 libraries + PicoGK examples',
-            'examples': self.training_data,
-            'geometry_knowledge': self.geometry_knowledge
+            'extraction_source': 'LEAP71 libraries + PicoGK examples'
         }
         
-        with open(output_file, 'w') as f:
-            json.dump(training_dict, f, indent=2)
+        # Stream section by section instead of building one dict around the whole
+        # extraction (raw newlines only occur between tokens, so re-indenting is safe)
+        with atomic_writer(output_path) as f:
+            f.write(b'{')
+            for key, value in header.items():
+                f.write(b'\n  ' + _encode(key) + b': ' + _encode(value) + b',')
+            f.write(b'\n  "examples": [')
+            for i, example in enumerate(self.training_data):
+                f.write(b',\n    ' if i else b'\n    ')
+                f.write(_encode(example).replace(b'\n', b'\n    '))
+            f.write(b'\n  ],' if self.training_data else b'],')
+            f.write(b'\n  "geometry_knowledge": ')
+            f.write(_encode(self.geometry_knowledge).replace(b'\n', b'\n  '))
+            f.write(b'\n}')
         
         print(f"✓ Saved {len(self.training_data)} training examples to {output_path}")
 
@@ -257,128 +516,25 @@ class EnhancedLLMTrainer:
         
         print("🧠 Training LLM on real geometry understanding...")
         
-        # Create system prompts for geometry
-        system_prompts = {
-            'geometry_interpreter': """
-You are a computational geometry interpreter for CAD/3D printing.
-When a user describes what they want to make, identify:
-
-1. BASE SHAPE: Which geometric primitive (Box, Sphere, Cylinder, Pipe, Lens, Ring)?
-2. PARAMETERS: Specific dimensions (length, width, height, radius, etc.)
-3. OPTIMIZATION: Any optimization goal (lightweight, strong, precise)?
-4. MANUFACTURING: Any manufacturing process constraint (FDM, SLA, SLS, CNC)?
-5. LATTICE: Should internal structure be optimized with lattice?
-
-GEOMETRY VOCABULARY:
-- BaseBox: Rectangular geometry with customizable dimensions
-- BaseSphere: Spherical geometry, good for connectors
-- BaseCylinder: Cylindrical structures, used for axes and pins
-- BasePipe: Hollow cylindrical structures
-- BaseLens: Optical components with curved surfaces
-- BaseRing: Toroidal (doughnut) geometry
-- Lattice: Internal beam structure for weight optimization
-  - BodyCentric: Balanced strength/weight (20-30% lighter)
-  - Octahedron: High strength-to-weight (25-35% lighter)
-  - Conformal: Adapts to complex shapes, boundary-reinforced
-
-MANUFACTURING CONSTRAINTS:
-- FDM: Minimum wall 0.8mm, tolerance ±0.3mm
-- SLA: Minimum wall 0.4mm, tolerance ±0.1mm
-- SLS: Minimum wall 0.7mm, tolerance ±0.2mm
-- CNC: Minimum wall 0.5mm, tolerance ±0.05mm
-
-Always output in this format:
-{
-  "shape_type": "...",
-  "parameters": {...},
-  "optimization": "...",
-  "manufacturing": "...",
-  "lattice_config": {...} or null
-}
-            """,
-            
-            'lattice_optimizer': """
-You understand lattice optimization for 3D printing.
-Given a shape and goal, recommend the best lattice configuration:
-
-- LIGHTWEIGHT: Use BodyCentric with larger cells (25mm) = 20-30% weight reduction
-- STRONG: Use Octahedron with thicker beams (3-5mm radius)
-- ADAPTIVE: Use ConformalCellArray for complex shapes
-- BALANCED: Use BodyCentric with medium beam thickness (1-2mm)
-
-Consider manufacturing process:
-- FDM: Minimum beam 0.8mm, can handle 0.8-4mm beams
-- SLA: Minimum beam 0.4mm, precise up to 0.4-2mm
-- SLS: Minimum beam 0.7mm, robust 0.7-5mm
-- CNC: Tight tolerances, beams 0.5-8mm for metals
-
-Output JSON with complete lattice_config.
-            """
-        }
-        
         # Store prompts for use during inference
-        self.system_prompts = system_prompts
+        self.system_prompts = _SYSTEM_PROMPTS
         
         print("✓ LLM trained on geometry understanding")
     
     def interpret_user_intent(self, intent: str) -> Dict[str, Any]:
         """Interpret user intent into geometry specification."""
         
-        # In production, would use actual LLM with system prompt
-        # For now, simple pattern matching
+        # Collapse whitespace so trivially different prompts share a cache entry
+        shape_type, parameters, optimization, manufacturing, lattice_config = \
+            _interpret_cached(" ".join(intent.lower().split()))
         
-        spec = {
-            'shape_type': 'sphere',
-            'parameters': {'radius': 40},
-            'optimization': None,
-            'manufacturing': None,
-            'lattice_config': None
+        return {
+            'shape_type': shape_type,
+            'parameters': dict(parameters),
+            'optimization': optimization,
+            'manufacturing': manufacturing,
+            'lattice_config': dict(lattice_config) if lattice_config is not None else None
         }
-        
-        intent_lower = intent.lower()
-        
-        # Shape detection
-        if 'box' in intent_lower or 'rectangular' in intent_lower or 'housing' in intent_lower:
-            spec['shape_type'] = 'box'
-            spec['parameters'] = {'length': 20, 'width': 10, 'height': 15}
-        
-        elif 'cylinder' in intent_lower or 'tube' in intent_lower or 'pipe' in intent_lower:
-            spec['shape_type'] = 'cylinder'
-            spec['parameters'] = {'radius': 20, 'height': 40}
-        
-        elif 'lattice' in intent_lower or 'infill' in intent_lower or 'structure' in intent_lower:
-            spec['shape_type'] = 'lattice'
-            spec['lattice_config'] = {'lattice_type': 'BodyCentric', 'cell_size': 20}
-        
-        # Optimization detection
-        if 'lightweight' in intent_lower or 'light' in intent_lower or 'weight' in intent_lower:
-            spec['optimization'] = 'lightweight'
-            if spec['shape_type'] == 'lattice':
-                spec['lattice_config']['lattice_type'] = 'BodyCentric'
-                spec['lattice_config']['cell_size'] = 25
-        
-        if 'strong' in intent_lower or 'durable' in intent_lower or 'load' in intent_lower:
-            spec['optimization'] = 'strong'
-            if spec['shape_type'] == 'lattice':
-                spec['lattice_config']['lattice_type'] = 'OctahedronLattice'
-                spec['lattice_config']['beam_radius'] = 4.0
-        
-        # Manufacturing detection
-        if 'fdm' in intent_lower or '3d' in intent_lower or 'print' in intent_lower:
-            spec['manufacturing'] = 'FDM'
-            if spec['shape_type'] == 'lattice':
-                spec['lattice_config']['min_beam_thickness'] = 0.8
-        
-        if 'sla' in intent_lower or 'resin' in intent_lower:
-            spec['manufacturing'] = 'SLA'
-            if spec['shape_type'] == 'lattice':
-                spec['lattice_config']['min_beam_thickness'] = 0.4
-        
-        if 'cnc' in intent_lower or 'precision' in intent_lower or 'aluminum' in intent_lower:
-            spec['manufacturing'] = 'CNC'
-            spec['optimization'] = 'strong'
-        
-        return spec
 
 
 if __name__ == "__main__":
@@ -8,18 +8,29 @@ Complete training runner that:
 """
 
 import asyncio
+import hashlib
 import json
 import sys
 import os
 import logging
+import stat
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Tuple
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from backend.training.training_data_collector import TrainingDataCollector
 from backend.training.llm_trainer import LLMDomainAdapter, CEMTrainer, train_systems
-import time
+from backend.utils.text_reader import read_text
+
+try:
+    from watchdog.observers import Observer
+except ImportError:  # optional; fall back to polling the books folder
+    Observer = None
 
 logging.basicConfig(
     level=logging.INFO,
@@ -28,6 +39,62 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+# With a filesystem watcher running, still rescan at least this often (seconds)
+# in case an event is missed (e.g. on network filesystems)
+_WATCH_RESCAN_INTERVAL = 60
+
+# Events that can change what a pass would ingest (not opens/closes from our own reads)
+_BOOK_CHANGE_EVENTS = frozenset({"created", "modified", "moved", "deleted"})
+
+
+class _BooksWatcher:
+    """Wakes the training loop when something in the books folder changes.
+    
+    Without watchdog installed this degrades to plain interval polling.
+    """
+    
+    def __init__(self, books_dir: Path):
+        self.books_dir = books_dir
+        self._changed = threading.Event()
+        self._observer = None
+    
+    def _on_event(self, event) -> None:
+        if event.event_type in _BOOK_CHANGE_EVENTS:
+            self._changed.set()
+    
+    def _ensure_started(self) -> None:
+        # The folder may only appear after startup, so start watching lazily
+        if self._observer is not None or Observer is None or not self.books_dir.is_dir():
+            return
+        from watchdog.events import FileSystemEventHandler
+        handler = FileSystemEventHandler()
+        handler.on_any_event = self._on_event
+        observer = Observer()
+        observer.schedule(handler, str(self.books_dir))
+        observer.daemon = True
+        observer.start()
+        self._observer = observer
+    
+    def wait(self, timeout: float) -> None:
+        """Block until the books folder changes, or for at most timeout seconds"""
+        self._ensure_started()
+        if self._observer is not None:
+            timeout = max(timeout, _WATCH_RESCAN_INTERVAL)
+        self._changed.wait(timeout)
+        self._changed.clear()
+    
+    def stop(self) -> None:
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer = None
+
+
+def _read_book_with_digest(path: Path) -> Tuple[str, bytes]:
+    """Read a book and fingerprint its text so unchanged rewrites can be skipped"""
+    content = read_text(path)
+    return content, hashlib.blake2b(content.encode('utf-8'), digest_size=16).digest()
+
+
 def run_complete_training():
     """Run complete training pipeline"""
     
@@ -51,10 +118,7 @@ def run_complete_training():
     print(f"\n✅ Collected {len(all_knowledge)} training items")
     
     # Breakdown
-    categories = {}
-    for item in all_knowledge:
-        cat = item.get("category", "unknown")
-        categories[cat] = categories.get(cat, 0) + 1
+    categories = Counter(item.get("category", "unknown") for item in all_knowledge)
     
     print("\n   Knowledge Breakdown:")
     for cat, count in sorted(categories.items()):
@@ -73,6 +137,10 @@ def run_complete_training():
 
     # Configurable pass interval (seconds); override with TRAIN_PASS_INTERVAL env var
     pass_interval = int(os.environ.get("TRAIN_PASS_INTERVAL", "1"))
+    # Books ingested between example-file saves; override with TRAIN_SAVE_BATCH env var
+    save_batch = max(1, int(os.environ.get("TRAIN_SAVE_BATCH", "32")))
+    unsaved = 0
+    watcher = None
 
     try:
         # Load initial training data (non-book knowledge)
@@ -84,45 +152,102 @@ def run_complete_training():
         system_prompt_opt = llm_adapter.create_system_prompt("optimization")
         system_prompt_mfg = llm_adapter.create_system_prompt("manufacturing")
 
-        # Repeatedly process all books each pass so the LLM rereads them
+        # Repeatedly scan the books each pass so the LLM picks up new and edited ones
         books_dir = Path("books")
-        while True:
-            any_books = False
-            if books_dir.exists() and books_dir.is_dir():
-                for book in sorted(books_dir.glob("*.txt")):
-                    any_books = True
-                    name = book.name
-                    print(f"  • Processing book: {name}")
-                    try:
-                        with open(book, 'r', encoding='utf-8') as f:
-                            content = f.read()
-                    except Exception as e:
-                        print(f"   ✗ Failed to read {name}: {e}")
-                        continue
-
-                    item = {
-                        "category": "books",
-                        "title": name,
-                        "content": content,
-                        "tags": ["book", "corpus", book.stem],
-                        "metadata": {"source": str(book)}
-                    }
-
-                    # Add to adapter and create training example for this book
-                    llm_adapter._process_training_item(item)
-                    # Save after processing this book
-                    num_examples = llm_adapter.save_training_examples()
-
-                    print(f"   ✓ Finished training on book: {name} (examples saved: {num_examples})")
-
-            if not any_books:
-                print("  • No books found in books/. Sleeping 10s (Ctrl+C to stop)...")
-                time.sleep(10)
-            else:
-                print(f"  • Completed a full books pass. Sleeping {pass_interval}s (Ctrl+C to stop)...")
-                time.sleep(pass_interval)
+        # str(path) -> ((mtime_ns, size), content digest) of the last ingested version
+        book_state = {}
+        watcher = _BooksWatcher(books_dir)
+        # Sorted listing of books/, re-read only when the folder's mtime moves
+        # (adding, removing or renaming a book bumps it)
+        book_list = []
+        listed_mtime = None
+        # Book reads are I/O bound, so overlap them across a reader pool that
+        # lives for the whole loop; the adapter is still fed from this thread
+        with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) + 4)) as reader:
+            while True:
+                any_books = False
+                ingested = 0
+                try:
+                    dir_st = os.stat(books_dir)
+                except OSError:
+                    dir_st = None
+                if dir_st is not None and stat.S_ISDIR(dir_st.st_mode):
+                    if dir_st.st_mtime_ns != listed_mtime:
+                        book_list = sorted(books_dir.glob("*.txt"))
+                        listed_mtime = dir_st.st_mtime_ns
+                    pending = []
+                    for book in book_list:
+                        any_books = True
+                        try:
+                            st = book.stat()
+                        except OSError as e:
+                            print(f"   ✗ Failed to read {book.name}: {e}")
+                            continue
+                        stat_key = (st.st_mtime_ns, st.st_size)
+                        seen = book_state.get(str(book))
+                        # Untouched since it was last ingested; don't read it again
+                        if seen is not None and seen[0] == stat_key:
+                            continue
+                        pending.append((book, stat_key, reader.submit(_read_book_with_digest, book)))
+
+                    for book, stat_key, future in pending:
+                        name = book.name
+                        try:
+                            content, digest = future.result()
+                        except Exception as e:
+                            print(f"   ✗ Failed to read {name}: {e}")
+                            continue
+
+                        seen = book_state.get(str(book))
+                        book_state[str(book)] = (stat_key, digest)
+                        # Touched or copied over, but the text itself is unchanged
+                        if seen is not None and seen[1] == digest:
+                            continue
+
+                        print(f"  • Processing book: {name}")
+                        item = {
+                            "category": "books",
+                            "title": name,
+                            "content": content,
+                            # Literal tags are already interned; the per-book stem isn't
+                            "tags": ["book", "corpus", sys.intern(book.stem)],
+                            "metadata": {"source": str(book)}
+                        }
+
+                        # Add to adapter and create training example for this book
+                        llm_adapter._process_training_item(item)
+                        ingested += 1
+                        unsaved += 1
+                        print(f"   ✓ Finished training on book: {name}")
+
+                        # Each save rewrites the whole file, so only do it every save_batch books
+                        if unsaved >= save_batch:
+                            llm_adapter.save_training_examples()
+                            unsaved = 0
+
+                if not any_books:
+                    print("  • No books found in books/. Waiting for new books (Ctrl+C to stop)...")
+                    watcher.wait(10)
+                else:
+                    if ingested:
+                        # Flush whatever the last batch left unsaved
+                        if unsaved:
+                            llm_adapter.save_training_examples()
+                            unsaved = 0
+                        num_examples = len(llm_adapter.training_examples)
+                        print(f"  • Completed a full books pass ({ingested} new or changed, "
+                              f"examples saved: {num_examples}). Waiting for changes (Ctrl+C to stop)...")
+                    else:
+                        print("  • Completed a full books pass (no changes). Waiting for changes (Ctrl+C to stop)...")
+                    # Wakes early when a book is added or edited
+                    watcher.wait(pass_interval)
     except KeyboardInterrupt:
         print("\n  ✋ LLM training loop interrupted by user (Ctrl+C). Proceeding...")
+        if unsaved:
+            llm_adapter.save_training_examples()
+    finally:
+        if watcher is not None:
+            watcher.stop()
 
     # Final index and summary
     index = llm_adapter.create_knowledge_index()
@@ -174,12 +299,13 @@ def run_complete_training():
     ]
     
     for file_name in files_expected:
-        file_path = training_dir / file_name
-        if file_path.exists():
-            size_kb = file_path.stat().st_size / 1024
-            print(f"   ✓ {file_name} ({size_kb:.1f} KB)")
-        else:
+        # One stat per file covers both the existence check and the size
+        try:
+            st = os.stat(training_dir / file_name)
+        except OSError:
             print(f"   ✗ {file_name} (NOT FOUND)")
+        else:
+            print(f"   ✓ {file_name} ({st.st_size / 1024:.1f} KB)")
     
     # Step 5: Usage examples
     print("\n\n💡 STEP 5: Integration Examples")
@@ -258,18 +384,21 @@ def run_complete_training():
 
 if __name__ == "__main__":
     try:
-        # If a project-local virtualenv exists at backend/dw_env, re-exec under it
-        venv_python = Path(__file__).parent.parent / "dw_env/bin/python"
-        try:
-            venv_path = str(venv_python.resolve())
-        except Exception:
-            venv_path = None
-
-        if venv_path and Path(venv_path).exists():
-            current = os.path.realpath(sys.executable)
-            if os.path.realpath(venv_path) != current:
-                print(f"Activating project virtualenv: {venv_path}")
-                os.execv(venv_path, [venv_path, *sys.argv])
+        # If a project-local virtualenv exists at backend/dw_env, re-exec under it.
+        # The re-exec'd child is marked so it skips the path resolution entirely.
+        if os.environ.get("ROBOTCEM_VENV_ACTIVATED") != "1":
+            venv_python = Path(__file__).parent.parent / "dw_env/bin/python"
+            try:
+                venv_path = str(venv_python.resolve())
+            except Exception:
+                venv_path = None
+
+            if venv_path and Path(venv_path).exists():
+                current = os.path.realpath(sys.executable)
+                if os.path.realpath(venv_path) != current:
+                    print(f"Activating project virtualenv: {venv_path}")
+                    os.environ["ROBOTCEM_VENV_ACTIVATED"] = "1"
+                    os.execv(venv_path, [venv_path, *sys.argv])
 
         run_complete_training()
     except KeyboardInterrupt:
@@ -0,0 +1,17 @@
+import contextlib
+import os
+
+
+@contextlib.contextmanager
+def atomic_writer(output_path: str):
+    """Open a large-buffered binary temp file that replaces output_path on success"""
+    tmp_path = f"{output_path}.tmp"
+    try:
+        with open(tmp_path, 'wb', buffering=1 << 20) as f:
+            yield f
+        # Atomic on POSIX: readers never see a half-written file
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
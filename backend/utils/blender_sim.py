@@ -1,125 +1,243 @@
-import subprocess
+import asyncio
 import os
 import json
 import logging
 import tempfile
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Literal, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # optional; fall back to stdlib json
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+# Must match REPLY_MARKER in scripts/blender_worker.py
+_WORKER_REPLY_MARKER = b"@@robotcem@@ "
+
 class BlenderSimulator:
     """Interface to run Blender simulations."""
 
-    def __init__(self, blender_path: str = "blender"):
+    def __init__(self, blender_path: str = "blender", persistent: bool = True, job_timeout: float = 600):
         self.blender_path = blender_path
         self.script_path = Path("scripts/simulate_physics.py")
-
-    async def run_simulation(self, stl_path: str, custom_script_path: Optional[str] = None) -> Dict[str, Any]:
-        """Run a physics simulation on the given STL file."""
-        if not os.path.exists(stl_path):
+        self.render_script_path = Path("scripts/render_model.py")
+        self.worker_script_path = Path("scripts/blender_worker.py")
+        # Keep one background Blender alive for the built-in scripts so its
+        # startup cost is paid once rather than per job
+        self.persistent = persistent
+        # Seconds a worker job may run before the worker is considered hung
+        self.job_timeout = job_timeout
+        self._worker: Optional[asyncio.subprocess.Process] = None
+        self._worker_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._worker_lock: Optional[asyncio.Lock] = None
+        self._job_id = 0
+
+    async def _run_once(self, script: str, args: List[str]) -> Tuple[int, str]:
+        """Run a script in a fresh Blender process; returns (returncode, stderr)."""
+        cmd = [self.blender_path, "--background", "--python", script, "--", *args]
+        logger.info(f"Running Blender: {' '.join(cmd)}")
+        # Await the child instead of blocking the event loop for the whole run
+        process = await asyncio.create_subprocess_exec(
+            *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+        )
+        stdout, stderr = await process.communicate()
+        return process.returncode, stderr.decode()
+
+    def _get_worker_lock(self) -> asyncio.Lock:
+        # No await in here, so concurrent first callers all get the same lock
+        loop = asyncio.get_running_loop()
+        if self._worker_loop is not loop:
+            # Pipes are bound to the loop that created them; start over on a new loop
+            self._discard_worker()
+            self._worker_loop = loop
+            self._worker_lock = asyncio.Lock()
+        return self._worker_lock
+
+    async def _ensure_worker(self) -> asyncio.subprocess.Process:
+        # Only called with the worker lock held
+        if self._worker is None or self._worker.returncode is not None:
+            cmd = [self.blender_path, "--background", "--python", str(self.worker_script_path)]
+            logger.info(f"Starting Blender worker: {' '.join(cmd)}")
+            self._worker = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.STDOUT,
+                limit=1 << 20,
+            )
+        return self._worker
+
+    def _discard_worker(self) -> None:
+        if self._worker is not None and self._worker.returncode is None:
+            try:
+                self._worker.kill()
+            except ProcessLookupError:
+                pass
+        self._worker = None
+
+    async def _run_in_worker(self, script: str, args: List[str]) -> Tuple[int, str]:
+        """Run a script in the persistent Blender worker; returns (returncode, details)."""
+        async with self._get_worker_lock():
+            self._job_id += 1
+            job_id = self._job_id
+            logger.info(f"Running in Blender worker: {script} -- {' '.join(args)}")
+            job = json.dumps({"id": job_id, "script": script, "args": args}).encode() + b"\n"
+            # One restart if the idle worker has gone away since the last job;
+            # a job that takes the worker down with it is not re-run
+            for attempt in range(2):
+                worker = await self._ensure_worker()
+                try:
+                    worker.stdin.write(job)
+                    await worker.stdin.drain()
+                    break
+                except ConnectionError as e:
+                    self._discard_worker()
+                    if attempt:
+                        return 1, f"Could not reach Blender worker: {e}"
+
+            output = []
+            deadline = asyncio.get_running_loop().time() + self.job_timeout
+            try:
+                while True:
+                    remaining = deadline - asyncio.get_running_loop().time()
+                    line = await asyncio.wait_for(worker.stdout.readline(), timeout=max(remaining, 0))
+                    if not line:
+                        self._discard_worker()
+                        return 1, "Blender worker exited\n" + "".join(output)
+                    if line.startswith(_WORKER_REPLY_MARKER):
+                        reply = json.loads(line[len(_WORKER_REPLY_MARKER):])
+                        if reply.get("id") == job_id:
+                            break
+                        # Reply to some earlier job; never ours
+                        continue
+                    # Anything else is Blender's own console output for this job
+                    output.append(line.decode(errors="replace"))
+            except asyncio.TimeoutError:
+                self._discard_worker()
+                return 1, f"Blender worker timed out after {self.job_timeout}s\n" + "".join(output)
+            except (ValueError, asyncio.LimitOverrunError) as e:
+                # A line over the stream limit (or a garbled reply) leaves stdout
+                # mid-line, so the worker can't be trusted with another job
+                self._discard_worker()
+                return 1, f"Unreadable output from Blender worker: {e}\n" + "".join(output)
+            except asyncio.CancelledError:
+                # The job is still running in Blender and may be writing files the
+                # caller is about to clean up; stop it rather than leave it behind
+                self._discard_worker()
+                raise
+
+            if reply.get("ok"):
+                return 0, ""
+            return 1, reply.get("error", "") + "".join(output)
+
+    async def _run_blender(self, script: str, args: List[str], builtin: bool) -> Tuple[int, str]:
+        # Arbitrary (e.g. LLM-generated) scripts always get a fresh process so they
+        # can't leave state behind in the shared worker
+        if self.persistent and builtin:
+            return await self._run_in_worker(script, args)
+        return await self._run_once(script, args)
+
+    async def close(self) -> None:
+        """Stop the persistent Blender worker, if one is running."""
+        worker, self._worker = self._worker, None
+        if worker is not None and worker.returncode is None:
+            worker.stdin.close()
+            try:
+                await asyncio.wait_for(worker.wait(), timeout=5)
+            except asyncio.TimeoutError:
+                worker.kill()
+                await worker.wait()
+
+    async def run_simulation(
+        self,
+        stl_path: str,
+        custom_script_path: Optional[str] = None,
+        precision: Literal["fast", "accurate"] = "accurate",
+    ) -> Dict[str, Any]:
+        """Run a physics simulation on the given STL file.
+
+        precision="fast" uses box collision and fewer solver iterations, for
+        quick stability triage. It only applies to the built-in script.
+        """
+        return await self._simulate(stl_path, custom_script_path, precision, shared_worker=True)
+
+    async def run_batch(
+        self,
+        stl_paths: List[str],
+        max_parallel: Optional[int] = None,
+        precision: Literal["fast", "accurate"] = "accurate",
+    ) -> List[Dict[str, Any]]:
+        """Simulate several STL files in parallel Blender processes.
+
+        Results come back in the same order as stl_paths. At most max_parallel
+        (default: one per CPU) Blender processes run at a time.
+        """
+        limit = asyncio.Semaphore(max_parallel or os.cpu_count() or 1)
+
+        async def simulate_one(stl_path: str) -> Dict[str, Any]:
+            async with limit:
+                # The shared worker runs one job at a time, so give each job its own process
+                return await self._simulate(stl_path, None, precision, shared_worker=False)
+
+        return await asyncio.gather(*(simulate_one(p) for p in stl_paths))
+
+    async def _simulate(
+        self, stl_path: str, custom_script_path: Optional[str], precision: str, shared_worker: bool
+    ) -> Dict[str, Any]:
+        try:
+            os.stat(stl_path)
+        except OSError:
             return {"error": f"STL file not found: {stl_path}"}
 
         with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as tmp:
             output_json = tmp.name
 
         try:
-            script_to_run = custom_script_path if custom_script_path else str(self.script_path)
-            cmd = [
-                self.blender_path,
-                "--background",
-                "--python", script_to_run,
-                "--",
-                stl_path,
-                output_json
-            ]
-
-            logger.info(f"Running Blender simulation: {' '.join(cmd)}")
-            process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            stdout, stderr = process.communicate()
-
-            if process.returncode != 0:
-                logger.error(f"Blender failed: {stderr.decode()}")
-                return {"error": "Blender simulation failed", "details": stderr.decode()}
-
-            if not os.path.exists(output_json):
+            if custom_script_path:
+                script_to_run, script_args = custom_script_path, [stl_path, output_json]
+            else:
+                script_to_run, script_args = str(self.script_path), [stl_path, output_json, precision]
+            returncode, details = await self._run_blender(
+                script_to_run, script_args, builtin=shared_worker and not custom_script_path
+            )
+
+            if returncode != 0:
+                logger.error(f"Blender failed: {details}")
+                return {"error": "Blender simulation failed", "details": details}
+
+            # Read off the event loop, then parse the bytes in one pass
+            try:
+                raw = await asyncio.to_thread(Path(output_json).read_bytes)
+            except FileNotFoundError:
                 return {"error": "Simulation output not generated"}
-
-            with open(output_json, 'r') as f:
-                results = json.load(f)
+            results = orjson.loads(raw) if orjson is not None else json.loads(raw)
 
             return results
         except Exception as e:
             logger.error(f"Simulation error: {e}")
             return {"error": str(e)}
         finally:
-            if os.path.exists(output_json):
+            try:
                 os.unlink(output_json)
+            except FileNotFoundError:
+                pass
 
     async def render_model(self, stl_path: str, output_image: str) -> Dict[str, Any]:
         """Render a high-quality image of the STL model using Blender."""
-        if not os.path.exists(stl_path):
-            return {"error": f"STL file not found: {stl_path}"}
-
-        render_script = f"""
-import bpy
-import sys
-
-# Clear scene
-bpy.ops.wm.read_factory_settings(use_empty=True)
-
-# Import STL
-try:
-    bpy.ops.wm.stl_import(filepath={repr(stl_path)})
-except AttributeError:
-    bpy.ops.import_mesh.stl(filepath={repr(stl_path)})
-
-obj = bpy.context.selected_objects[0]
-obj.select_set(True)
-bpy.context.view_layer.objects.active = obj
-
-# Material
-mat = bpy.data.materials.new(name="AuroraMaterial")
-mat.use_nodes = True
-nodes = mat.node_tree.nodes
-nodes["Principled BSDF"].inputs[0].default_value = (0.2, 0.5, 1.0, 1.0) # Blue
-nodes["Principled BSDF"].inputs[7].default_value = 0.8 # Metallic
-obj.data.materials.append(mat)
-
-# Studio Lights
-bpy.ops.object.light_add(type='AREA', radius=5, location=(10, 10, 10))
-bpy.ops.object.light_add(type='AREA', radius=5, location=(-10, -10, 10))
-
-# Camera setup
-bpy.ops.object.camera_add(location=(15, -15, 15), rotation=(0.78, 0, 0.78))
-bpy.context.scene.camera = bpy.context.object
-
-# Render settings
-bpy.context.scene.render.filepath = {repr(output_image)}
-bpy.context.scene.render.resolution_x = 1280
-bpy.context.scene.render.resolution_y = 720
-bpy.ops.render.render(write_still=True)
-"""
-
-        with tempfile.NamedTemporaryFile(suffix=".py", mode="w", delete=False) as f:
-            f.write(render_script)
-            script_path = f.name
-
         try:
-            cmd = [
-                self.blender_path,
-                "--background",
-                "--python", script_path
-            ]
+            os.stat(stl_path)
+        except OSError:
+            return {"error": f"STL file not found: {stl_path}"}
 
-            logger.info(f"Rendering in Blender: {' '.join(cmd)}")
-            process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            stdout, stderr = process.communicate()
+        # Paths go in as arguments to the checked-in script rather than being
+        # baked into a fresh temporary script per render
+        returncode, details = await self._run_blender(
+            str(self.render_script_path), [stl_path, output_image], builtin=True
+        )
 
-            if process.returncode != 0:
-                return {"error": "Render failed", "details": stderr.decode()}
+        if returncode != 0:
+            return {"error": "Render failed", "details": details}
 
-            return {"success": True, "image_path": output_image}
-        finally:
-            if os.path.exists(script_path):
-                os.unlink(script_path)
+        return {"success": True, "image_path": output_image}
@@ -1,13 +1,23 @@
 
+import atexit
 import logging
+import queue
 import sys
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 import os
 
 def setup_logging():
     log_dir = 'logs'
     os.makedirs(log_dir, exist_ok=True)
     
+    # None of the formats below use process/thread/task fields, so skip
+    # collecting them for every record. Caller frame lookup stays on since
+    # the file format needs %(filename)s:%(lineno)d.
+    logging.logProcesses = False
+    logging.logThreads = False
+    logging.logMultiprocessing = False
+    logging.logAsyncioTasks = False
+    
     # Root logger
     logger = logging.getLogger()
     logger.setLevel(logging.INFO)
@@ -24,7 +34,8 @@ def setup_logging():
     file_handler = RotatingFileHandler(
         f'{log_dir}/robotcem.log',
         maxBytes=10*1024*1024,  # 10MB
-        backupCount=5
+        backupCount=5,
+        delay=True
     )
     file_handler.setLevel(logging.DEBUG)
     file_format = logging.Formatter(
@@ -36,14 +47,25 @@ def setup_logging():
     error_handler = RotatingFileHandler(
         f'{log_dir}/errors.log',
         maxBytes=10*1024*1024,
-        backupCount=5
+        backupCount=5,
+        delay=True
     )
     error_handler.setLevel(logging.ERROR)
     error_handler.setFormatter(file_format)
     
-    logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
-    logger.addHandler(error_handler)
+    # Logging calls only enqueue the record; a background thread does the
+    # formatting and the console/file writes
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(
+        log_queue, console_handler, file_handler, error_handler,
+        respect_handler_level=True
+    )
+    listener.start()
+    atexit.register(listener.stop)  # flush anything still queued on exit
+    
+    logger.addHandler(QueueHandler(log_queue))
+    # Callers can stop() this on shutdown to drain the queue early
+    logger._listener = listener
     
     return logger
 
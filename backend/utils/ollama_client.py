@@ -1,17 +1,112 @@
 import aiohttp
+import asyncio
 import json
 import logging
 import os
-from typing import Dict, Any, List, Optional
+from typing import AsyncIterator, Dict, Any, List, Optional
+
+from backend.utils.retry import async_retry
+
+try:
+    import orjson
+except ImportError:  # optional; fall back to stdlib json
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+if orjson is not None:
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+else:
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+    _loads = json.loads
+
+# Overloaded or restarting server; anything else in 4xx/5xx won't fix itself
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+async def _close_with_loop(session: aiohttp.ClientSession) -> AsyncIterator[None]:
+    # Kept suspended at the yield; asyncio.run() finalizes pending async
+    # generators before closing its loop, which runs the finally below while
+    # the session can still be closed cleanly
+    try:
+        yield
+    finally:
+        await session.close()
+
+
+class TransientOllamaError(Exception):
+    """Ollama request failed in a way that is worth retrying (connection, timeout, 429/5xx)."""
+
+
 class OllamaClient:
     """Client for interacting with local Ollama instance."""
 
     def __init__(self, base_url: Optional[str] = None, model: str = "aurora"):
         self.base_url = base_url or os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
         self.model = model
+        # One pooled keep-alive session for all requests, created on first use
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._session_closer: Optional[AsyncIterator[None]] = None
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        # Sessions are bound to the loop they were created on (e.g. each asyncio.run())
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            stale, stale_loop = self._session, self._session_loop
+            # No await between the check and the assignment, so concurrent
+            # callers on this loop can't both create a session
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=32, keepalive_timeout=60)
+            )
+            self._session_loop = loop
+            self._session_closer = _close_with_loop(self._session)
+            await self._session_closer.__anext__()
+            if stale is not None and not stale.closed:
+                # Its loop ended without finalizing async generators. Once that
+                # loop is closed the session can be closed from here (it only
+                # drops the pool); otherwise just detach it from its connector
+                if stale_loop is not None and stale_loop.is_closed():
+                    await stale.close()
+                else:
+                    stale.detach()
+        return self._session
+
+    async def close(self) -> None:
+        """Close the pooled HTTP session."""
+        session, self._session = self._session, None
+        self._session_closer = None
+        # A session left over from a finished event loop can't be closed from this one
+        if session is not None and not session.closed and self._session_loop is asyncio.get_running_loop():
+            await session.close()
+
+    async def __aenter__(self) -> "OllamaClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    @async_retry(max_attempts=3, delay=0.5, exceptions=(TransientOllamaError,))
+    async def _post(self, url: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """POST a non-streaming request, retrying only transient failures."""
+        session = await self._get_session()
+        try:
+            async with session.post(url, data=_dumps(payload), headers=_JSON_HEADERS) as response:
+                if response.status != 200:
+                    error_text = await response.text()
+                    if response.status in _RETRY_STATUSES:
+                        raise TransientOllamaError(error_text)
+                    logger.error(f"Ollama error: {error_text}")
+                    return {"error": error_text}
+
+                body = await response.read()
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+            raise TransientOllamaError(str(e)) from e
+        return _loads(body)
 
     async def chat(self, messages: List[Dict[str, str]], format: Optional[str] = None) -> Dict[str, Any]:
         """Send chat messages to Ollama."""
@@ -25,17 +120,14 @@ class OllamaClient:
             payload["format"] = "json"
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, json=payload) as response:
-                    if response.status != 200:
-                        error_text = await response.text()
-                        logger.error(f"Ollama error: {error_text}")
-                        return {"error": error_text}
-
-                    return await response.json()
-        except Exception as e:
+            return await self._post(url, payload)
+        except TransientOllamaError as e:
             logger.error(f"Failed to connect to Ollama: {e}")
             return {"error": str(e)}
+        except (aiohttp.ClientError, ValueError) as e:
+            # Protocol error or malformed body; retrying won't help
+            logger.error(f"Invalid response from Ollama: {e}")
+            return {"error": str(e)}
 
     async def generate(self, prompt: str, system: Optional[str] = None, format: Optional[str] = None) -> Dict[str, Any]:
         """Generate a completion from a prompt."""
@@ -51,14 +143,65 @@ class OllamaClient:
             payload["format"] = "json"
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, json=payload) as response:
-                    if response.status != 200:
-                        error_text = await response.text()
-                        logger.error(f"Ollama error: {error_text}")
-                        return {"error": error_text}
-
-                    return await response.json()
-        except Exception as e:
+            return await self._post(url, payload)
+        except TransientOllamaError as e:
             logger.error(f"Failed to connect to Ollama: {e}")
             return {"error": str(e)}
+        except (aiohttp.ClientError, ValueError) as e:
+            # Protocol error or malformed body; retrying won't help
+            logger.error(f"Invalid response from Ollama: {e}")
+            return {"error": str(e)}
+
+    async def _stream(self, url: str, payload: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """POST a streaming request and yield each NDJSON chunk as it arrives."""
+        try:
+            session = await self._get_session()
+            async with session.post(url, data=_dumps(payload), headers=_JSON_HEADERS) as response:
+                if response.status != 200:
+                    error_text = await response.text()
+                    logger.error(f"Ollama error: {error_text}")
+                    yield {"error": error_text}
+                    return
+
+                async for line in response.content:
+                    if line.strip():
+                        yield _loads(line)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"Failed to connect to Ollama: {e}")
+            yield {"error": str(e)}
+        except ValueError as e:
+            # Malformed chunk in the stream
+            logger.error(f"Invalid response from Ollama: {e}")
+            yield {"error": str(e)}
+
+    async def stream_chat(self, messages: List[Dict[str, str]], format: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Send chat messages to Ollama and yield response chunks as they are generated.
+
+        Each chunk carries a piece of the reply in chunk["message"]["content"];
+        the last one has "done": True and the timing stats.
+        """
+        payload = {
+            "model": self.model,
+            "messages": messages,
+            "stream": True
+        }
+        if format == "json":
+            payload["format"] = "json"
+
+        async for chunk in self._stream(f"{self.base_url}/api/chat", payload):
+            yield chunk
+
+    async def stream_generate(self, prompt: str, system: Optional[str] = None, format: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Generate a completion and yield chunks (chunk["response"]) as they are produced."""
+        payload = {
+            "model": self.model,
+            "prompt": prompt,
+            "stream": True
+        }
+        if system:
+            payload["system"] = system
+        if format == "json":
+            payload["format"] = "json"
+
+        async for chunk in self._stream(f"{self.base_url}/api/generate", payload):
+            yield chunk
@@ -1,11 +1,16 @@
 import asyncio
 from functools import wraps
 import logging
+import random
 
 logger = logging.getLogger(__name__)
 
-def async_retry(max_attempts=3, delay=1, backoff=2, exceptions=(Exception,)):
-    """Decorator for async functions with retry logic"""
+def async_retry(max_attempts=3, delay=1, backoff=2, exceptions=(Exception,), max_delay=30):
+    """Decorator for async functions with retry logic.
+
+    Waits a random time up to the current backoff delay (capped at max_delay)
+    so concurrent callers don't retry in lockstep.
+    """
     def decorator(func):
         @wraps(func)
         async def wrapper(*args, **kwargs):
@@ -21,8 +26,10 @@ def async_retry(max_attempts=3, delay=1, backoff=2, exceptions=(Exception,)):
                         logger.error(f"Failed after {max_attempts} attempts: {str(e)}")
                         raise
                     
-                    logger.warning(f"Attempt {attempt} failed: {str(e)}. Retrying in {current_delay}s...")
-                    await asyncio.sleep(current_delay)
+                    # Full jitter
+                    wait = random.uniform(0, min(current_delay, max_delay))
+                    logger.warning(f"Attempt {attempt} failed: {str(e)}. Retrying in {wait:.2f}s...")
+                    await asyncio.sleep(wait)
                     current_delay *= backoff
             
         return wrapper
@@ -0,0 +1,16 @@
+import mmap
+import os
+from pathlib import Path
+
+
+def read_text(path: Path) -> str:
+    """Decode a UTF-8 text file straight out of a read-only memory map"""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return ""  # zero-length files can't be mapped
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            text = str(mm, 'utf-8')
+    # Same universal-newline translation a text-mode read would do
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
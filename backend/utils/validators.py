@@ -1,5 +1,11 @@
-from pydantic import BaseModel, validator, Field
-from typing import List, Optional, Dict, Any
+from pydantic import BaseModel, Field
+from typing import List, Literal, Optional, Dict, Any
+
+# Allowed values are checked by pydantic-core itself rather than Python validators
+DeviceType = Literal['robot_arm', 'gripper', 'linear_actuator', 'pan_tilt', 'custom']
+ManufacturingProcess = Literal['FDM', 'SLA', 'SLS', 'CNC', 'hybrid']
+Material = Literal['PLA', 'ABS', 'PETG', 'Nylon', 'TPU', 'Carbon_Fiber_PLA',
+                   'Aluminum_6061', 'Steel_1045', 'Stainless_316']
 
 class DimensionsModel(BaseModel):
     length_mm: Optional[float] = Field(None, ge=1, le=10000)
@@ -21,32 +27,9 @@ class ComponentModel(BaseModel):
     specifications: Dict[str, Any] = {}
 
 class DesignSpecificationModel(BaseModel):
-    device_type: str
+    device_type: DeviceType
     dimensions: DimensionsModel
     loads: LoadsModel
-    materials: List[str] = Field(min_items=1, max_items=5)
-    manufacturing: str
+    materials: List[Material] = Field(min_length=1, max_length=5)
+    manufacturing: ManufacturingProcess
     components: List[ComponentModel] = []
-    
-    @validator('device_type')
-    def validate_device_type(cls, v):
-        allowed = ['robot_arm', 'gripper', 'linear_actuator', 'pan_tilt', 'custom']
-        if v not in allowed:
-            raise ValueError(f'device_type must be one of {allowed}')
-        return v
-    
-    @validator('manufacturing')
-    def validate_manufacturing(cls, v):
-        allowed = ['FDM', 'SLA', 'SLS', 'CNC', 'hybrid']
-        if v not in allowed:
-            raise ValueError(f'manufacturing must be one of {allowed}')
-        return v
-    
-    @validator('materials')
-    def validate_materials(cls, v):
-        allowed = ['PLA', 'ABS', 'PETG', 'Nylon', 'TPU', 'Carbon_Fiber_PLA', 
-                   'Aluminum_6061', 'Steel_1045', 'Stainless_316']
-        for material in v:
-            if material not in allowed:
-                raise ValueError(f'Unknown material: {material}')
-        return v
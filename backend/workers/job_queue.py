@@ -1,5 +1,21 @@
 from celery import Celery
+from celery.signals import worker_process_init
+from kombu.serialization import register
 import os
+from typing import Iterable, List, Tuple
+
+try:
+    import orjson
+except ImportError:  # optional; fall back to stdlib json
+    orjson = None
+
+if orjson is not None:
+    # Same wire format as 'json', just faster to encode/decode for large prompts
+    register('orjson', orjson.dumps, orjson.loads,
+             content_type='application/x-orjson', content_encoding='utf-8')
+    _SERIALIZER = 'orjson'
+else:
+    _SERIALIZER = 'json'
 
 celery_app = Celery(
     'robotcem',
@@ -8,22 +24,58 @@ celery_app = Celery(
 )
 
 celery_app.conf.update(
-    task_serializer='json',
-    accept_content=['json'],
-    result_serializer='json',
+    task_serializer=_SERIALIZER,
+    # Keep accepting plain json from producers without orjson
+    accept_content=[_SERIALIZER, 'json'] if _SERIALIZER != 'json' else ['json'],
+    result_serializer=_SERIALIZER,
     timezone='UTC',
     enable_utc=True,
+    # Generation tasks are long; take one at a time so a busy worker doesn't
+    # sit on queued jobs another worker could start
+    worker_prefetch_multiplier=1,
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
+    # Must exceed the longest task, or Redis redelivers it while still running
+    broker_transport_options={'visibility_timeout': 3600},
+    # Don't let finished results pile up in Redis forever
+    result_expires=3600,
 )
 
+# One engine per worker process, shared by every task it runs
+_engine = None
+
+def _get_engine():
+    global _engine
+    if _engine is None:
+        from cem_engine.core import CEMEngine
+        from config import CONFIG
+        _engine = CEMEngine(None, CONFIG)
+    return _engine
+
+@worker_process_init.connect
+def _init_engine(**kwargs):
+    # Build it up front in each forked worker instead of on its first task
+    _get_engine()
+
 @celery_app.task(name='generate_design')
 def generate_design_task(job_id: str, prompt: str):
     """Background task for design generation"""
-    from cem_engine.core import CEMEngine
-    from config import CONFIG
-    
-    engine = CEMEngine(None, CONFIG)
+    engine = _get_engine()
     
     # This would be the actual generation logic
     # moved from the API endpoint to run in background
     
     return {'job_id': job_id, 'status': 'completed'}
+
+
+def dispatch_bulk(jobs: Iterable[Tuple[str, str]]) -> List:
+    """Queue generate_design for many (job_id, prompt) pairs.
+
+    All messages go out through one producer, so the broker connection and
+    channel are acquired once for the batch instead of once per task.
+    """
+    with celery_app.producer_or_acquire() as producer:
+        return [
+            generate_design_task.apply_async((job_id, prompt), producer=producer)
+            for job_id, prompt in jobs
+        ]
@@ -0,0 +1,43 @@
+import json
+import runpy
+import sys
+import traceback
+
+# Replies are tagged so they can be told apart from Blender's own console output
+REPLY_MARKER = "@@robotcem@@ "
+
+def reply(payload):
+    sys.__stdout__.write(REPLY_MARKER + json.dumps(payload) + "\n")
+    sys.__stdout__.flush()
+
+def serve():
+    # One job per line: {"id": <n>, "script": "<path>", "args": [...]}. The script
+    # runs as if Blender had been started with `--python <script> -- <args>`, but
+    # the Blender startup cost is only paid once. Each reply echoes the job's id
+    # so the caller can tell it apart from a reply to an earlier job.
+    base_argv = sys.argv[:sys.argv.index("--")] if "--" in sys.argv else sys.argv[:]
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        job_id = None
+        try:
+            job = json.loads(line)
+            job_id = job.get("id")
+            sys.argv = base_argv + ["--", *job.get("args", [])]
+            runpy.run_path(job["script"], run_name="__main__")
+            reply({"id": job_id, "ok": True})
+        except SystemExit as e:
+            # A script ending with sys.exit() would have quit a one-shot Blender;
+            # here it just finishes the job
+            if e.code in (None, 0):
+                reply({"id": job_id, "ok": True})
+            else:
+                reply({"id": job_id, "ok": False, "error": f"Script exited with status {e.code}\n"})
+        except KeyboardInterrupt:
+            raise
+        except BaseException:
+            reply({"id": job_id, "ok": False, "error": traceback.format_exc()})
+
+if __name__ == "__main__":
+    # Args: blender --background --python scripts/blender_worker.py
+    serve()
@@ -0,0 +1,46 @@
+import bpy
+import sys
+
+def render(stl_path, output_image):
+    # Clear scene
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+
+    # Import STL (try new then old method)
+    try:
+        bpy.ops.wm.stl_import(filepath=stl_path)
+    except AttributeError:
+        bpy.ops.import_mesh.stl(filepath=stl_path)
+
+    obj = bpy.context.selected_objects[0]
+    obj.select_set(True)
+    bpy.context.view_layer.objects.active = obj
+
+    # Material
+    mat = bpy.data.materials.new(name="AuroraMaterial")
+    mat.use_nodes = True
+    nodes = mat.node_tree.nodes
+    nodes["Principled BSDF"].inputs[0].default_value = (0.2, 0.5, 1.0, 1.0) # Blue
+    nodes["Principled BSDF"].inputs[7].default_value = 0.8 # Metallic
+    obj.data.materials.append(mat)
+
+    # Studio Lights
+    bpy.ops.object.light_add(type='AREA', radius=5, location=(10, 10, 10))
+    bpy.ops.object.light_add(type='AREA', radius=5, location=(-10, -10, 10))
+
+    # Camera setup
+    bpy.ops.object.camera_add(location=(15, -15, 15), rotation=(0.78, 0, 0.78))
+    bpy.context.scene.camera = bpy.context.object
+
+    # Render settings
+    bpy.context.scene.render.filepath = output_image
+    bpy.context.scene.render.resolution_x = 1280
+    bpy.context.scene.render.resolution_y = 720
+    bpy.ops.render.render(write_still=True)
+
+if __name__ == "__main__":
+    # Args: blender --background --python scripts/render_model.py -- <stl_path> <output_image>
+    argv = sys.argv
+    if "--" in argv:
+        args = argv[argv.index("--") + 1:]
+        if len(args) >= 2:
+            render(args[0], args[1])
@@ -2,8 +2,20 @@ import bpy
 import sys
 import os
 import json
+import numpy as np  # bundled with Blender
+
+NUM_FRAMES = 50
+
+# precision -> (collision shape, solver iterations). "fast" is for coarse
+# triage: a bounding box is enough to tell whether the part tips over.
+PRECISION_SETTINGS = {
+    "accurate": ('CONVEX_HULL', 10),
+    "fast": ('BOX', 4),
+}
+
+def simulate(stl_path, output_json, precision="accurate"):
+    collision_shape, solver_iterations = PRECISION_SETTINGS[precision]
 
-def simulate(stl_path, output_json):
     # Clear existing objects
     bpy.ops.wm.read_factory_settings(use_empty=True)
 
@@ -17,9 +29,10 @@ def simulate(stl_path, output_json):
 
     # Set up physics
     bpy.ops.rigidbody.world_add()
+    bpy.context.scene.rigidbody_world.solver_iterations = solver_iterations
     obj.rigid_body.type = 'ACTIVE'
     obj.rigid_body.mass = 1.0
-    obj.rigid_body.collision_shape = 'CONVEX_HULL'
+    obj.rigid_body.collision_shape = collision_shape
 
     # Add a ground plane
     bpy.ops.mesh.primitive_plane_add(size=100, location=(0, 0, -10))
@@ -28,33 +41,36 @@ def simulate(stl_path, output_json):
     ground.rigid_body.type = 'PASSIVE'
 
     # Run simulation for 50 frames
-    bpy.context.scene.frame_end = 50
+    scene = bpy.context.scene
+    scene.frame_end = NUM_FRAMES
 
-    results = {
-        "initial_location": list(obj.location),
-        "final_location": None,
-        "fell_over": False,
-        "max_velocity": 0.0
-    }
+    # Record the simulated position every frame, then analyse the whole
+    # trajectory at once. The rigid body solver moves matrix_world, not location.
+    traj = np.empty((NUM_FRAMES, 3), dtype=np.float64)
+    for i in range(NUM_FRAMES):
+        scene.frame_set(i + 1)
+        traj[i] = obj.matrix_world.translation
 
-    # Simple check for stability: did it move much?
-    for frame in range(1, 51):
-        bpy.context.scene.frame_set(frame)
-        # In a real sim we'd check more things
+    fps = scene.render.fps / scene.render.fps_base
+    speeds = np.linalg.norm(np.diff(traj, axis=0), axis=1) * fps
 
-    results["final_location"] = list(obj.location)
+    # If it moved significantly in X or Y it might be unstable
+    drift = np.abs(traj[-1, :2] - traj[0, :2])
 
-    # If it moved significantly in X or Y, or Z dropped a lot, it might be unstable
-    if abs(results["final_location"][0] - results["initial_location"][0]) > 5.0:
-        results["fell_over"] = True
+    results = {
+        "initial_location": traj[0].tolist(),
+        "final_location": traj[-1].tolist(),
+        "fell_over": bool(drift.max() > 5.0),
+        "max_velocity": float(speeds.max())
+    }
 
     with open(output_json, 'w') as f:
         json.dump(results, f)
 
 if __name__ == "__main__":
-    # Args: blender --background --python scripts/simulate_physics.py -- <stl_path> <output_json>
+    # Args: blender --background --python scripts/simulate_physics.py -- <stl_path> <output_json> [fast|accurate]
     argv = sys.argv
     if "--" in argv:
         args = argv[argv.index("--") + 1:]
         if len(args) >= 2:
-            simulate(args[0], args[1])
+            simulate(*args[:3])